@@ -0,0 +1,99 @@
+# adaptive.py - Adaptive question selection with an early stop
+#
+# The respondent's stratum s (1-7) is treated as unknown with a posterior that
+# every answer sharpens. Each option is assumed to be chosen with probability
+# proportional to exp(-(level - s)^2 / (2 * noise^2)), i.e. people mostly pick
+# the option nearest their own stratum. The next question is the unanswered one
+# with the largest expected information gain (expected drop in posterior
+# entropy), and the assessment stops once the posterior's standard deviation
+# falls below a threshold.
+#
+# The likelihoods of the whole bank are one (questions x options x strata)
+# array built once, so picking the next question is a few vectorized numpy
+# operations regardless of how many hundreds of items the bank holds.
+#
+# Answers are positional: selections[i] is the option index chosen for
+# question i, or None when it was not asked.
+#
+# The app uses adaptive mode with TIME_SPAN_ADAPTIVE=1 or ?adaptive=1 (see
+# session_record.adaptive_enabled) and imports this module only then.
+from functools import lru_cache
+
+import numpy as np
+
+from scoring.questions import QUESTION_BANK
+
+STRATA = np.arange(1, 8, dtype=np.float64)
+
+DEFAULT_NOISE = 1.0
+DEFAULT_THRESHOLD = 0.4
+DEFAULT_MIN_QUESTIONS = 4
+
+
+def _entropy(p, axis=-1):
+    return -np.sum(np.where(p > 0, p * np.log(np.where(p > 0, p, 1.0)), 0.0), axis=axis)
+
+
+class AdaptivePlan:
+    """Posterior updates and next-question selection for one question bank"""
+
+    def __init__(self, bank=QUESTION_BANK, noise=DEFAULT_NOISE):
+        # Banks loaded by scoring.loader expose all levels without decoding texts
+        bank_levels = getattr(bank, "levels", None) or [question.levels for question in bank]
+        self.size = len(bank_levels)
+        width = max(len(question_levels) for question_levels in bank_levels)
+        levels = np.full((self.size, width), np.nan)
+        for i, question_levels in enumerate(bank_levels):
+            levels[i, :len(question_levels)] = question_levels
+
+        # P(option | stratum), zero for padding beyond a question's options
+        weights = np.exp(-((levels[:, :, None] - STRATA) ** 2) / (2 * noise ** 2))
+        weights = np.nan_to_num(weights, nan=0.0)
+        self.likelihood = weights / weights.sum(axis=1, keepdims=True)
+
+    def posterior(self, selections):
+        """Posterior over strata 1-7 given the answers so far"""
+        log_posterior = np.zeros(len(STRATA))
+        for i, option_index in enumerate(selections):
+            if option_index is not None:
+                log_posterior += np.log(self.likelihood[i, option_index])
+        posterior = np.exp(log_posterior - log_posterior.max())
+        return posterior / posterior.sum()
+
+    def estimate(self, selections):
+        """(mean, standard deviation) of the stratum posterior"""
+        posterior = self.posterior(selections)
+        mean = float(posterior @ STRATA)
+        return mean, float(np.sqrt(posterior @ (STRATA - mean) ** 2))
+
+    def next_question(self, selections):
+        """Index of the most informative unanswered question, or None when all are answered"""
+        asked = np.zeros(self.size, dtype=bool)
+        asked[[i for i, option_index in enumerate(selections) if option_index is not None]] = True
+        candidates = np.flatnonzero(~asked)
+        if not len(candidates):
+            return None
+
+        posterior = self.posterior(selections)
+        joint = self.likelihood[candidates] * posterior             # candidates x options x strata
+        predictive = joint.sum(axis=2)                              # P(option) per candidate
+        updated = joint / np.where(predictive > 0, predictive, 1.0)[:, :, None]
+        expected_entropy = np.sum(predictive * _entropy(updated), axis=1)
+        # Lowest expected entropy = highest information gain; ties go to bank order
+        return int(candidates[np.argmin(expected_entropy)])
+
+    def is_done(self, selections, threshold=DEFAULT_THRESHOLD, min_questions=DEFAULT_MIN_QUESTIONS,
+                max_questions=None):
+        """True once the estimate is certain enough or no questions remain"""
+        answered = sum(option_index is not None for option_index in selections)
+        if answered >= min(max_questions or self.size, self.size):
+            return True
+        if answered < min_questions:
+            return False
+        return self.estimate(selections)[1] < threshold
+
+
+@lru_cache(maxsize=None)
+def default_plan():
+    """AdaptivePlan for QUESTION_BANK, built once per process"""
+    return AdaptivePlan()
@@ -0,0 +1,422 @@
+# assessment_store.py - Persistent SQLite store of completed assessments
+#
+# The result page hands each completed assessment to record(), which only
+# puts it on a queue. A background writer thread drains the queue and
+# group-commits everything waiting in one transaction, so the UI thread never
+# waits on disk. The database runs in WAL mode, so reads (reports, the cohort
+# dashboard) proceed concurrently with writes.
+#
+# Each committed batch also updates the cohort_rollups table in the same
+# transaction: one row per (cohort, purpose, final stratum) with respondent
+# counts and per-question level sums and answer counts. Team views read those
+# few rows instead of scanning raw assessments.
+#
+# Adaptive assessments stop before every question is asked: their unasked
+# questions are NULL in the level columns and UNANSWERED in options, and
+# per-question means only count the respondents who answered.
+#
+# The store also keeps StreamingAggregates (per-category mean/variance and
+# stratum histograms) in memory. Each batch writes the snapshots of the groups
+# it touched to aggregate_groups in the same transaction, so a new process
+# seeds them from those few rows instead of rescanning every assessment.
+#
+# Set TIME_SPAN_DB to choose the database file, or to an empty string to turn
+# persistence off.
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from scoring.questions import QUESTION_BANK, answer_levels
+from session_record import UNANSWERED
+from streaming_aggregates import StreamingAggregates
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "assessments.db")
+
+LEVEL_COLUMNS = [f"q{i + 1}" for i in range(len(QUESTION_BANK))]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    respondent_id TEXT,
+    cohort TEXT NOT NULL DEFAULT '',
+    completed_at TEXT NOT NULL,
+    language TEXT NOT NULL,
+    purpose_id INTEGER,
+    purpose TEXT,
+    final_stratum INTEGER NOT NULL,
+    options BLOB NOT NULL,
+    {", ".join(f"{column} INTEGER" for column in LEVEL_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_purpose ON assessments (purpose_id, completed_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_completed ON assessments (completed_at);
+CREATE INDEX IF NOT EXISTS idx_assessments_stratum ON assessments (final_stratum, completed_at);
+"""
+
+# purpose_id -1 stands for free-text purposes so it can be part of the key
+ROLLUP_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS cohort_rollups (
+    cohort TEXT NOT NULL,
+    purpose_id INTEGER NOT NULL,
+    final_stratum INTEGER NOT NULL,
+    respondents INTEGER NOT NULL,
+    {", ".join(f"sum_{column} INTEGER NOT NULL" for column in LEVEL_COLUMNS)},
+    {", ".join(f"answered_{column} INTEGER NOT NULL" for column in LEVEL_COLUMNS)},
+    PRIMARY KEY (cohort, purpose_id, final_stratum)
+) WITHOUT ROWID;
+"""
+
+ROLLUP_TOTALS = [f"sum_{column}" for column in LEVEL_COLUMNS] + [f"answered_{column}" for column in LEVEL_COLUMNS]
+
+ROLLUP_UPSERT = (
+    f"INSERT INTO cohort_rollups (cohort, purpose_id, final_stratum, respondents, {', '.join(ROLLUP_TOTALS)}) "
+    f"VALUES ({', '.join('?' * (4 + len(ROLLUP_TOTALS)))}) "
+    f"ON CONFLICT (cohort, purpose_id, final_stratum) DO UPDATE SET respondents = respondents + excluded.respondents, "
+    + ", ".join(f"{total} = {total} + excluded.{total}" for total in ROLLUP_TOTALS)
+)
+
+ROLLUP_REBUILD = (
+    f"INSERT INTO cohort_rollups (cohort, purpose_id, final_stratum, respondents, {', '.join(ROLLUP_TOTALS)}) "
+    f"SELECT cohort, COALESCE(purpose_id, -1), final_stratum, COUNT(*), "
+    f"{', '.join(f'COALESCE(SUM({column}), 0)' for column in LEVEL_COLUMNS)}, "
+    f"{', '.join(f'COUNT({column})' for column in LEVEL_COLUMNS)} "
+    f"FROM assessments GROUP BY cohort, COALESCE(purpose_id, -1), final_stratum"
+)
+
+# StreamingAggregates.to_dict() entry per (cohort, purpose), -1 as above
+AGGREGATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregate_groups (
+    cohort TEXT NOT NULL,
+    purpose_id INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (cohort, purpose_id)
+) WITHOUT ROWID;
+"""
+
+AGGREGATE_UPSERT = "INSERT OR REPLACE INTO aggregate_groups (cohort, purpose_id, state) VALUES (?, ?, ?)"
+
+INSERT = (
+    f"INSERT INTO assessments (respondent_id, cohort, completed_at, language, purpose_id, purpose, final_stratum, "
+    f"options, {', '.join(LEVEL_COLUMNS)}) VALUES ({', '.join('?' * (8 + len(LEVEL_COLUMNS)))})"
+)
+
+# Positions of fields in an INSERT parameter tuple
+COHORT, PURPOSE_ID, FINAL_STRATUM, FIRST_LEVEL = 1, 4, 6, 8
+
+
+def _allow_unanswered(connection, columns):
+    """Recreate an assessments table whose level columns are NOT NULL, keeping its rows"""
+    connection.execute("BEGIN")
+    try:
+        connection.execute("ALTER TABLE assessments RENAME TO assessments_old")
+        # The old table's indexes moved with it and would block recreating them
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'assessments_old' "
+            "AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (index,) in indexes:
+            connection.execute(f"DROP INDEX {index}")
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                connection.execute(statement)
+        connection.execute(
+            f"INSERT INTO assessments ({', '.join(columns)}) SELECT {', '.join(columns)} FROM assessments_old"
+        )
+        connection.execute("DROP TABLE assessments_old")
+        # Rollups from before answered_* counts are rebuilt below
+        connection.execute("DROP TABLE IF EXISTS cohort_rollups")
+        connection.commit()
+    except sqlite3.Error:
+        connection.rollback()
+        raise
+
+
+def connect(path):
+    """Open a connection in WAL mode with the schema in place"""
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent with NORMAL; only the last commits can be lost on power failure
+    connection.execute("PRAGMA synchronous=NORMAL")
+    columns = {row[1]: row[3] for row in connection.execute("PRAGMA table_info(assessments)")}
+    if columns and "cohort" not in columns:
+        # Stores created before cohorts existed
+        with connection:
+            connection.execute("ALTER TABLE assessments ADD COLUMN cohort TEXT NOT NULL DEFAULT ''")
+        columns["cohort"] = 1
+    if columns.get(LEVEL_COLUMNS[0]):
+        # Stores created before adaptive results were recorded
+        _allow_unanswered(connection, list(columns))
+    with connection:
+        has_rollups = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cohort_rollups'"
+        ).fetchone()
+        connection.executescript(SCHEMA + ROLLUP_SCHEMA + AGGREGATE_SCHEMA)
+        if not has_rollups:
+            connection.execute(ROLLUP_REBUILD)
+    return connection
+
+
+def rollup_rows(batch):
+    """Pre-aggregate INSERT parameter tuples into cohort_rollups upsert rows"""
+    questions = len(LEVEL_COLUMNS)
+    totals = defaultdict(lambda: [0] * (1 + 2 * questions))
+    for row in batch:
+        purpose_id = row[PURPOSE_ID]
+        key = (row[COHORT], -1 if purpose_id is None else purpose_id, row[FINAL_STRATUM])
+        total = totals[key]
+        total[0] += 1
+        for i, level in enumerate(row[FIRST_LEVEL:], start=1):
+            if level is not None:
+                total[i] += level
+                total[i + questions] += 1
+    return [key + tuple(total) for key, total in totals.items()]
+
+
+def aggregate_rows(aggregates):
+    """aggregate_groups upsert rows for every group in a StreamingAggregates"""
+    return [
+        (group["cohort"], -1 if group["purpose_id"] is None else group["purpose_id"], json.dumps(group))
+        for group in aggregates.to_dict()["groups"]
+    ]
+
+
+class AssessmentStore:
+    """Queue-backed writer plus indexed read queries over completed assessments"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self.aggregates = StreamingAggregates()
+        self.aggregates_ready = threading.Event()
+        connect(path).close()
+        self._writer = threading.Thread(target=self._write_loop, name="assessment-store-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, selections, final_stratum, language, purpose_id=None, purpose=None,
+               respondent_id=None, completed_at=None, cohort=""):
+        """Queue one completed assessment for writing; never blocks on disk"""
+        completed_at = completed_at or datetime.now()
+        self._queue.put((
+            respondent_id,
+            cohort or "",
+            completed_at.isoformat(timespec="seconds"),
+            language,
+            purpose_id,
+            purpose,
+            final_stratum,
+            bytes(UNANSWERED if option_index is None else option_index for option_index in selections),
+            *answer_levels(selections),
+        ))
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        # Unlike Queue.join(), stop waiting if the writer thread is gone
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and self._writer.is_alive():
+                self._queue.all_tasks_done.wait(self.flush_interval)
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+    def _seed_aggregates(self, connection):
+        groups = [json.loads(state) for (state,) in connection.execute("SELECT state FROM aggregate_groups")]
+        aggregates = StreamingAggregates.from_dict({"groups": groups})
+        respondents = connection.execute("SELECT COALESCE(SUM(respondents), 0) FROM cohort_rollups").fetchone()[0]
+        if aggregates.summary()["count"] != respondents:
+            # Stores written before the snapshots existed: rebuild them once
+            aggregates = StreamingAggregates()
+            rows = connection.execute(
+                f"SELECT cohort, purpose_id, final_stratum, {', '.join(LEVEL_COLUMNS)} FROM assessments"
+            )
+            for cohort, purpose_id, final_stratum, *levels in rows:
+                aggregates.add(levels, final_stratum, purpose_id, cohort)
+            with connection:
+                connection.execute("DELETE FROM aggregate_groups")
+                connection.executemany(AGGREGATE_UPSERT, aggregate_rows(aggregates))
+        self.aggregates.merge(aggregates)
+        self.aggregates_ready.set()
+
+    def _commit(self, connection, batch):
+        """Insert a batch and update its rollups and aggregate snapshots in one transaction"""
+        added = StreamingAggregates()
+        for row in batch:
+            added.add(row[FIRST_LEVEL:], row[FINAL_STRATUM], row[PURPOSE_ID], row[COHORT])
+        touched = StreamingAggregates.from_dict(self.aggregates.to_dict(added.keys()))
+        touched.merge(added)
+        with connection:
+            connection.executemany(INSERT, batch)
+            connection.executemany(ROLLUP_UPSERT, rollup_rows(batch))
+            connection.executemany(AGGREGATE_UPSERT, aggregate_rows(touched))
+        self.aggregates.merge(added)
+
+    def _write_loop(self):
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as e:
+            # Without a connection every batch is dropped below, but the queue
+            # keeps draining so flush() and close() still return
+            print(f"assessment store: cannot open {self.path}: {e}", file=sys.stderr)
+            connection = None
+        try:
+            if connection is not None:
+                self._seed_aggregates(connection)
+        except Exception as e:
+            # aggregates_ready stays unset; a wrong count is rebuilt on the next start
+            print(f"assessment store: aggregates not seeded: {e}", file=sys.stderr)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            batch = [item]
+            # Group commit: take whatever else arrives within flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                if connection is None:
+                    raise sqlite3.OperationalError("no database connection")
+                self._commit(connection, batch)
+            except Exception as e:
+                # Keep the writer alive; losing a batch must not stall the app
+                print(f"assessment store: dropped {len(batch)} assessments: {e}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    # Queries (each uses its own short-lived read connection)
+
+    def _query(self, sql, params=()):
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _filters(purpose_id=None, start=None, end=None, final_stratum=None):
+        clauses, params = [], []
+        if purpose_id is not None:
+            clauses.append("purpose_id = ?")
+            params.append(purpose_id)
+        if final_stratum is not None:
+            clauses.append("final_stratum = ?")
+            params.append(final_stratum)
+        if start is not None:
+            clauses.append("completed_at >= ?")
+            params.append(start.isoformat(timespec="seconds"))
+        if end is not None:
+            clauses.append("completed_at < ?")
+            params.append(end.isoformat(timespec="seconds"))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, purpose_id=None, start=None, end=None, final_stratum=None):
+        """Number of assessments matching the filters"""
+        where, params = self._filters(purpose_id, start, end, final_stratum)
+        return self._query(f"SELECT COUNT(*) FROM assessments{where}", params)[0][0]
+
+    def stratum_distribution(self, purpose_id=None, start=None, end=None):
+        """{final_stratum: count} for assessments matching the filters"""
+        where, params = self._filters(purpose_id, start, end)
+        rows = self._query(f"SELECT final_stratum, COUNT(*) FROM assessments{where} GROUP BY final_stratum", params)
+        return dict(rows)
+
+    def recent(self, limit=100, purpose_id=None, final_stratum=None):
+        """Latest assessments as dicts, newest first"""
+        where, params = self._filters(purpose_id, final_stratum=final_stratum)
+        rows = self._query(
+            f"SELECT id, respondent_id, completed_at, language, purpose_id, final_stratum, options "
+            f"FROM assessments{where} ORDER BY completed_at DESC LIMIT ?",
+            params + [limit],
+        )
+        keys = ("id", "respondent_id", "completed_at", "language", "purpose_id", "final_stratum", "options")
+        return [
+            dict(zip(keys, row[:-1] + ([None if o == UNANSWERED else o for o in row[-1]],)))
+            for row in rows
+        ]
+
+
+    def cohorts(self):
+        """Names of all cohorts with at least one assessment"""
+        return [row[0] for row in self._query("SELECT DISTINCT cohort FROM cohort_rollups ORDER BY cohort")]
+
+    def cohort_rollup(self, cohort=None, purpose_id=None):
+        """Aggregate a cohort (None for everyone) from the rollup table
+
+        Returns respondents, stratum_counts {stratum: n}, question_means (one
+        mean level per question over those who answered it, None if nobody
+        did) and purposes {purpose_id: (n, mean stratum)}, with purpose_id
+        None for free-text purposes.
+        """
+        clauses, params = [], []
+        if cohort is not None:
+            clauses.append("cohort = ?")
+            params.append(cohort)
+        if purpose_id is not None:
+            clauses.append("purpose_id = ?")
+            params.append(purpose_id)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        rows = self._query(
+            f"SELECT purpose_id, final_stratum, respondents, {', '.join(ROLLUP_TOTALS)} FROM cohort_rollups{where}",
+            params,
+        )
+
+        respondents = 0
+        stratum_counts = defaultdict(int)
+        level_totals = [0] * len(ROLLUP_TOTALS)
+        purpose_totals = defaultdict(lambda: [0, 0])
+        for purpose, stratum, n, *totals in rows:
+            respondents += n
+            stratum_counts[stratum] += n
+            for i, total in enumerate(totals):
+                level_totals[i] += total
+            purpose_total = purpose_totals[None if purpose == -1 else purpose]
+            purpose_total[0] += n
+            purpose_total[1] += n * stratum
+
+        return {
+            "respondents": respondents,
+            "stratum_counts": dict(sorted(stratum_counts.items())),
+            "question_means": [
+                level_sum / answered if answered else None
+                for level_sum, answered in zip(level_totals[:len(LEVEL_COLUMNS)], level_totals[len(LEVEL_COLUMNS):])
+            ] if respondents else [],
+            "purposes": {p: (n, strata / n) for p, (n, strata) in purpose_totals.items()},
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store at TIME_SPAN_DB (None if persistence is turned off)"""
+    global _store
+    path = os.environ.get("TIME_SPAN_DB", DEFAULT_DB_PATH)
+    if not path:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = AssessmentStore(path)
+            # The writer is a daemon thread; commit what is queued on shutdown
+            atexit.register(_store.close)
+    return _store
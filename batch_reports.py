@@ -0,0 +1,137 @@
+# batch_reports.py - Render one summary report per respondent, in parallel
+#
+# Usage:
+#   python batch_reports.py responses.jsonl -o reports/ --format markdown html --workers 4
+#
+# Input is the same CSV/JSONL as bulk_score.py. Each worker renders a chunk
+# with the per-language templates from scoring/reports.py and writes the
+# files itself, returning only a count, so memory stays bounded by the chunks
+# in flight rather than the size of the result set. Files are named after the
+# respondent id (or the response's position when there is none); the main
+# process hands out the names, and a name already used in the run (duplicate
+# ids, ids that differ only in unsafe characters or case) gets the response's
+# position appended, so no report overwrites another.
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from bulk_score import chunked, read_responses
+from config.languages import LANGUAGES
+from scoring import PURPOSE_KEYS, calculate_average_level, interpret_level
+from scoring.questions import answer_levels
+from scoring.reports import FILE_EXTENSIONS, FORMATS, compile_report
+
+_UNSAFE_FILENAME = re.compile(r"[^\w.-]+")
+
+
+def report_name(respondent_id, position):
+    """File name stem for a report"""
+    if respondent_id is None or str(respondent_id).strip() == "":
+        return f"response-{position:06d}"
+    return _UNSAFE_FILENAME.sub("_", str(respondent_id)).strip("._") or f"response-{position:06d}"
+
+
+class ReportNames:
+    """Hands out report file stems that are unique within one run"""
+
+    def __init__(self):
+        # Case-folded, as the output directory may be on a case-insensitive file system
+        self._taken = set()
+        self.renamed = 0
+
+    def assign(self, respondent_id, position):
+        stem = report_name(respondent_id, position)
+        if stem.casefold() in self._taken:
+            self.renamed += 1
+            while stem.casefold() in self._taken:
+                stem = f"{stem}-{position:06d}"
+        self._taken.add(stem.casefold())
+        return stem
+
+    def name_chunk(self, chunk, start):
+        """Replace each response's respondent id with its file stem"""
+        return [(self.assign(response[0], position),) + tuple(response[1:])
+                for position, response in enumerate(chunk, start=start)]
+
+
+def render_chunk(chunk, output_dir, formats):
+    """Render and write the reports for a named chunk (runs in a worker process); return the file count"""
+    written = 0
+    for stem, selections, purpose, language, completed_at in chunk:
+        answers = answer_levels(selections)
+        avg_level = calculate_average_level(answers)
+        summary, description = interpret_level(avg_level, purpose, language)
+        for file_format in formats:
+            report = compile_report(language, file_format).render(
+                answers, avg_level, summary, description, purpose, completed_at
+            )
+            path = os.path.join(output_dir, stem + FILE_EXTENSIONS[file_format])
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(report)
+            written += 1
+    return written
+
+
+def render_reports(responses, output_dir, formats, workers, chunk_size, names=None):
+    """Render reports for a stream of parsed responses; yield file counts as chunks finish"""
+    names = names or ReportNames()
+    chunks = chunked(responses, chunk_size)
+    if workers <= 1:
+        start = 1
+        for chunk in chunks:
+            yield render_chunk(names.name_chunk(chunk, start), output_dir, formats)
+            start += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        start = 1
+        for chunk in chunks:
+            pending.add(pool.submit(render_chunk, names.name_chunk(chunk, start), output_dir, formats))
+            start += len(chunk)
+            # Keep at most 2 chunks per worker in flight, in any completion order
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Time Span Estimator summary reports in bulk.")
+    parser.add_argument("input", help="CSV or JSONL file with one response per row")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for the report files")
+    parser.add_argument("--format", nargs="+", default=["markdown"], choices=FORMATS, dest="formats",
+                        help="report formats to write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (1 renders in-process)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="responses per worker task")
+    parser.add_argument("--language", default="en", choices=list(LANGUAGES.keys()),
+                        help="language for rows without one")
+    parser.add_argument("--purpose", default="purpose_self", choices=PURPOSE_KEYS,
+                        help="purpose for rows without one")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    formats = tuple(dict.fromkeys(args.formats))
+    count = 0
+    names = ReportNames()
+    try:
+        responses = read_responses(args.input, args.language, args.purpose)
+        for written in render_reports(responses, args.output_dir, formats, args.workers, args.chunk_size, names):
+            count += written
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"batch_reports: {e}\n")
+    print(f"Wrote {count} reports to {args.output_dir}", file=sys.stderr)
+    if names.renamed:
+        print(f"{names.renamed} reports had a file name already in use; their position was appended",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/adaptive.py - Questions saved and accuracy of adaptive selection
+# Run from the repository root: python -m benchmarks.adaptive [respondents] [--threshold T]
+#
+# Simulated respondents with a known stratum answer under the same noisy
+# nearest-level model the plan assumes. Each one takes both the full linear
+# assessment and the adaptive one; the report compares the number of questions
+# and how often both give the same final stratum. It also times next-question
+# selection on the real bank and on a synthetic bank of several hundred items.
+import argparse
+import time
+
+import numpy as np
+
+from adaptive import DEFAULT_MIN_QUESTIONS, DEFAULT_THRESHOLD, AdaptivePlan, default_plan
+from scoring import calculate_average_level
+from scoring.questions import QUESTION_BANK, CompiledQuestion, answer_levels
+
+
+def simulate_answers(plan, stratum, rng):
+    """One option index per question, drawn from P(option | stratum)"""
+    probabilities = plan.likelihood[:, :, stratum - 1]
+    return [int(rng.choice(len(p), p=p)) for p in probabilities]
+
+
+def run_adaptive(plan, answers, threshold, min_questions):
+    selections = [None] * plan.size
+    while not plan.is_done(selections, threshold, min_questions):
+        i = plan.next_question(selections)
+        selections[i] = answers[i]
+    return selections
+
+
+def synthetic_bank(n, rng):
+    questions = []
+    for _ in range(n):
+        levels = sorted(rng.choice(np.arange(1, 8), size=4, replace=False).tolist())
+        options = [f"Option {level}" for level in levels]
+        questions.append({"text": {"en": "?"}, "options": {"en": options}, "levels": levels})
+    return tuple(CompiledQuestion(i + 1, q) for i, q in enumerate(questions))
+
+
+def time_selection(plan, answered, repeat=200):
+    selections = [None] * plan.size
+    for i in range(answered):
+        selections[i] = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        plan.next_question(selections)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate adaptive vs. linear assessments.")
+    parser.add_argument("respondents", nargs="?", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-questions", type=int, default=DEFAULT_MIN_QUESTIONS)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    plan = default_plan()
+    asked = []
+    exact = within_one = full_correct = adaptive_correct = 0
+    for _ in range(args.respondents):
+        stratum = int(rng.integers(1, 8))
+        answers = simulate_answers(plan, stratum, rng)
+        full = calculate_average_level(answer_levels(answers))
+        selections = run_adaptive(plan, answers, args.threshold, args.min_questions)
+        adaptive = calculate_average_level(answer_levels(selections))
+        asked.append(sum(s is not None for s in selections))
+        exact += adaptive == full
+        full_correct += full == stratum
+        adaptive_correct += adaptive == stratum
+        within_one += abs(adaptive - full) <= 1
+
+    n = args.respondents
+    print(f"respondents:          {n} (threshold {args.threshold}, at least {args.min_questions} questions)")
+    print(f"questions asked:      {np.mean(asked):.2f} of {len(QUESTION_BANK)} on average "
+          f"(median {np.median(asked):.0f}, max {max(asked)})")
+    print(f"same stratum as full: {exact / n:.1%} (within one level: {within_one / n:.1%})")
+    print(f"true stratum found:   linear {full_correct / n:.1%}, adaptive {adaptive_correct / n:.1%}")
+
+    print(f"next_question, {len(QUESTION_BANK)}-item bank:   {time_selection(plan, 4) * 1e6:8.1f} us")
+    for size in (200, 500, 1000):
+        big = AdaptivePlan(synthetic_bank(size, rng))
+        print(f"next_question, {size}-item bank: {time_selection(big, 10, repeat=50) * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
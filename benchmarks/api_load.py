@@ -0,0 +1,146 @@
+# benchmarks/api_load.py - Load test for the scoring API
+# Run from the repository root: python -m benchmarks.api_load [--requests N] [--concurrency C]
+#
+# Starts scoring_api.py on a free local port (or targets --url), then drives it
+# from C concurrent keep-alive connections and reports latency percentiles and
+# throughput. --batch-size > 1 posts to /score/batch instead of /score.
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from benchmarks.batch_scoring import synthetic_answers
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client on asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def post(self, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+        )
+        status_line = await self.reader.readline()
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return int(status_line.split()[1])
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+def request_bodies(count, batch_size):
+    """Pre-encoded request bodies so the client measures the server, not json.dumps"""
+    rows = synthetic_answers(count * batch_size).tolist()
+    if batch_size == 1:
+        return [json.dumps({"id": i, "answers": row}).encode("utf-8") for i, row in enumerate(rows)]
+    return [
+        json.dumps({"responses": [{"id": i * batch_size + j, "answers": row}
+                                  for j, row in enumerate(rows[i * batch_size:(i + 1) * batch_size])]}).encode("utf-8")
+        for i in range(count)
+    ]
+
+
+async def run_load(host, port, path, bodies, concurrency):
+    latencies = []
+    errors = 0
+    queue = iter(bodies)
+
+    async def client():
+        nonlocal errors
+        connection = Connection(host, port)
+        try:
+            for body in queue:
+                start = time.perf_counter()
+                status = await connection.post(path, body)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"scoring API did not start on {host}:{port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the scoring API.")
+    parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8000 (default: start one)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--batch-size", type=int, default=1, help="responses per request")
+    parser.add_argument("--workers", type=int, default=1, help="server processes when starting one")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = subprocess.Popen([sys.executable, "scoring_api.py", "--port", str(port),
+                                   "--workers", str(args.workers)])
+    try:
+        wait_for_server(host, port)
+        path = "/score" if args.batch_size == 1 else "/score/batch"
+        # Warm-up (imports, caches, connection setup) is not measured
+        asyncio.run(run_load(host, port, path, request_bodies(args.concurrency, args.batch_size), args.concurrency))
+        bodies = request_bodies(args.requests, args.batch_size)
+        latencies, errors, seconds = asyncio.run(run_load(host, port, path, bodies, args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    ms = np.array(latencies) * 1000
+    print(f"requests:     {len(latencies)} x {args.batch_size} responses ({errors} errors)")
+    print(f"concurrency:  {args.concurrency} keep-alive connections")
+    print(f"latency p50:  {np.percentile(ms, 50):.2f} ms")
+    print(f"latency p99:  {np.percentile(ms, 99):.2f} ms")
+    print(f"latency max:  {ms.max():.2f} ms")
+    print(f"throughput:   {len(latencies) / seconds:,.0f} req/s ({len(latencies) * args.batch_size / seconds:,.0f} responses/s)")
+
+
+if __name__ == "__main__":
+    main()
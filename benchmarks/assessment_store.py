@@ -0,0 +1,63 @@
+# benchmarks/assessment_store.py - Write throughput and indexed queries at scale
+# Run from the repository root: python -m benchmarks.assessment_store [N]
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from assessment_store import AssessmentStore
+from scoring.batch import levels_from_options, stratum_levels
+from scoring.questions import QUESTION_BANK
+
+
+def timed(label, fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<42} {best * 1000:8.2f} ms  -> {result if not isinstance(result, list) else len(result)}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    options = rng.integers(0, [len(q) for q in QUESTION_BANK], size=(n, len(QUESTION_BANK)))
+    strata = stratum_levels(levels_from_options(options))
+    purposes = rng.integers(0, 3, size=n)
+    cohorts = rng.integers(0, 50, size=n)
+    base = datetime(2025, 1, 1)
+    minutes = np.sort(rng.integers(0, 365 * 24 * 60, size=n))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AssessmentStore(os.path.join(tmp_dir, "bench.db"), batch_size=5000)
+        start = time.perf_counter()
+        enqueue_worst = 0.0
+        for i in range(n):
+            t = time.perf_counter()
+            store.record(options[i].tolist(), int(strata[i]), "en", purpose_id=int(purposes[i]),
+                         completed_at=base + timedelta(minutes=int(minutes[i])), cohort=f"team-{cohorts[i]}")
+            enqueue_worst = max(enqueue_worst, time.perf_counter() - t)
+        store.flush()
+        seconds = time.perf_counter() - start
+        print(f"wrote {n:,} assessments in {seconds:.1f}s ({n / seconds:,.0f}/s), "
+              f"slowest record() call {enqueue_worst * 1000:.2f} ms")
+
+        day = base + timedelta(days=180)
+        week = day + timedelta(days=7)
+        print("queries (best of 5):")
+        timed("count, one purpose, one week", lambda: store.count(purpose_id=1, start=day, end=week))
+        timed("stratum distribution, one week", lambda: store.stratum_distribution(start=day, end=week))
+        timed("count at stratum 6, one week", lambda: store.count(final_stratum=6, start=day, end=week))
+        timed("100 most recent at stratum 5", lambda: store.recent(100, final_stratum=5))
+        timed("stratum distribution, all rows", lambda: store.stratum_distribution())
+        timed("cohort rollup, one team", lambda: store.cohort_rollup("team-7")["respondents"])
+        timed("cohort rollup, everyone", lambda: store.cohort_rollup()["respondents"])
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
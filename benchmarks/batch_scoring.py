@@ -0,0 +1,55 @@
+# benchmarks/batch_scoring.py - Per-person vs. vectorized cohort scoring
+# Run from the repository root: python -m benchmarks.batch_scoring [N]
+import sys
+import time
+
+import numpy as np
+
+from scoring.batch import score_batch, row_analysis
+from scoring import QUESTION_BANK, calculate_average_level, analyze_by_category, get_strength_weakness_analysis
+
+
+def synthetic_answers(n, seed=0):
+    """Random but valid answer levels for n respondents"""
+    rng = np.random.default_rng(seed)
+    columns = [rng.choice(question.levels, size=n) for question in QUESTION_BANK]
+    return np.stack(columns, axis=1)
+
+
+def score_per_person(rows, language):
+    results = []
+    for answers in rows:
+        category_averages = analyze_by_category(answers, language)
+        strengths, weaknesses = get_strength_weakness_analysis(category_averages)
+        results.append((calculate_average_level(answers), category_averages, strengths, weaknesses,
+                        max(answers) - min(answers)))
+    return results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    language = "en"
+    matrix = synthetic_answers(n)
+    rows = matrix.tolist()
+
+    start = time.perf_counter()
+    expected = score_per_person(rows, language)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_batch(matrix, language)
+    batch_seconds = time.perf_counter() - start
+
+    for i, (level, category_averages, strengths, weaknesses, level_range) in enumerate(expected):
+        assert scores["levels"][i] == level, f"row {i}: level mismatch"
+        assert scores["level_range"][i] == level_range, f"row {i}: range mismatch"
+        assert row_analysis(scores, i) == (category_averages, strengths, weaknesses), f"row {i}: analysis mismatch"
+
+    print(f"respondents:  {n}")
+    print(f"per-person:   {loop_seconds:.3f}s ({n / loop_seconds:,.0f} rows/s)")
+    print(f"vectorized:   {batch_seconds:.3f}s ({n / batch_seconds:,.0f} rows/s)")
+    print(f"speedup:      {loop_seconds / batch_seconds:.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
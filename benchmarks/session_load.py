@@ -0,0 +1,336 @@
+# benchmarks/session_load.py - Concurrent respondents against a running app server
+# Run from the repository root:
+#   python -m benchmarks.session_load --sessions 200 --rate 20
+#   python -m benchmarks.session_load --answers responses.jsonl --think-time 2
+#   python -m benchmarks.session_load --url http://host:8501 --pid 1234
+#
+# Starts `streamlit run main.py` on a free local port (or targets --url), then
+# plays respondents over the same websocket protocol the browser uses: load the
+# start page, pick a purpose, click Start, answer every question the app shows
+# (fragment reruns, in whatever order adaptive mode picks) and wait for the
+# result page. Respondents arrive as a Poisson process at --rate per second
+# (0 = all at once) and wait --think-time seconds on average between clicks.
+#
+# Answer streams are synthetic (seeded, so a run can be replayed exactly) or
+# recorded: --answers takes a CSV/JSONL file in bulk_score.py's input format
+# and cycles through it, keeping each row's language and purpose.
+#
+# Reports per-step and overall rerun latency percentiles (click sent -> the
+# run's final script_finished), session throughput, and the server's CPU and
+# RSS sampled while the load runs. CPU/RSS need psutil and the server's pid,
+# which is known when this script starts the server (or pass --pid).
+import argparse
+import asyncio
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from websockets.asyncio.client import connect
+
+from benchmarks.api_load import free_port
+from bulk_score import read_responses
+from config.languages import LANGUAGES, get_text
+from scoring import PURPOSE_KEYS, purpose_id
+from scoring.questions import QUESTION_BANK
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+STEPS = ("load", "language", "start", "answer", "result")
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+QUESTION_KEY = re.compile(r"-q_(\d+)$")
+
+
+class Respondent:
+    """Answer stream of one simulated respondent"""
+
+    def __init__(self, selections, purpose_index=0, language="en"):
+        self.selections = selections
+        self.purpose_index = purpose_index
+        self.language = language
+
+
+def synthetic_respondents(count, seed=0, language="en"):
+    rng = random.Random(seed)
+    return [
+        Respondent([rng.randrange(len(question)) for question in QUESTION_BANK], rng.randrange(len(PURPOSE_KEYS)),
+                   language)
+        for _ in range(count)
+    ]
+
+
+def recorded_respondents(path, count, language="en"):
+    """Respondents replaying rows of a bulk_score.py input file, cycled to count"""
+    rows = [
+        Respondent(selections, purpose_id(purpose, row_language) or 0, row_language)
+        for _, selections, purpose, row_language, _ in read_responses(path, language, get_text(PURPOSE_KEYS[0], language))
+    ]
+    if not rows:
+        raise ValueError(f"{path}: no responses")
+    return [rows[i % len(rows)] for i in range(count)]
+
+
+class AppSession:
+    """One browser-like websocket session: send a rerun, collect widgets until the run finishes"""
+
+    def __init__(self, ws, query_string, timeout):
+        self.ws = ws
+        self.query_string = query_string
+        self.timeout = timeout
+        self.page_script_hash = ""
+        self.widgets = {}  # element type -> [(id, label, fragment_id), ...] from the last rerun
+
+    async def rerun(self, widget_states=(), fragment_id=""):
+        """Send a rerun and wait for its final script_finished; returns the round-trip seconds"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        msg.rerun_script.fragment_id = fragment_id
+        for widget_id, field, value in widget_states:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            setattr(state, field, value)
+        self.widgets = {}
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._until_finished(), self.timeout)
+        return time.perf_counter() - start
+
+    async def _until_finished(self):
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self.ws.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = forward.new_session.page_script_hash
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._collect(forward.delta)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("script failed to compile")
+                # A run that ends in st.rerun() is followed by the run that counts
+                if forward.script_finished in FINISHED:
+                    return
+
+    def _collect(self, delta):
+        element_type = delta.new_element.WhichOneof("type")
+        element = getattr(delta.new_element, element_type)
+        if element_type == "exception":
+            raise RuntimeError(f"app raised {element.type}: {element.message}")
+        widget_id = getattr(element, "id", "")
+        if widget_id:
+            self.widgets.setdefault(element_type, []).append((widget_id, getattr(element, "label", ""), delta.fragment_id))
+
+    def widget(self, element_type, label=None):
+        for widget in self.widgets.get(element_type, ()):
+            if label is None or widget[1] == label:
+                return widget
+        raise RuntimeError(f"no {element_type} {label or ''} on the page".replace("  ", " "))
+
+
+async def run_respondent(base_url, respondent, args, record):
+    """Play one respondent from start page to result page; record(step, seconds) per rerun"""
+
+    async def think():
+        if args.think_time > 0:
+            await asyncio.sleep(random.expovariate(1 / args.think_time))
+
+    language = respondent.language
+    query_string = "adaptive=1" if args.adaptive else ""
+    async with connect(f"{base_url}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        session = AppSession(ws, query_string, args.timeout)
+        record("load", await session.rerun())
+        if language != "en":
+            selector_id = session.widget("selectbox", "🌐 Language / Språk")[0]
+            record("language", await session.rerun([(selector_id, "string_value", LANGUAGES[language])]))
+        await think()
+
+        purpose_widget = session.widget("selectbox", get_text("purpose_label", language))[0]
+        start_button = session.widget("button", get_text("start_button", language))[0]
+        record("start", await session.rerun([
+            (purpose_widget, "string_value", get_text(PURPOSE_KEYS[respondent.purpose_index], language)),
+            (start_button, "trigger_value", True),
+        ]))
+
+        # Each question is a fragment rerun; the last answer switches to the result page
+        while "radio" in session.widgets:
+            radio_id, _, fragment_id = session.widget("radio")
+            q_index = int(QUESTION_KEY.search(radio_id).group(1))
+            option_text = QUESTION_BANK[q_index].option_text(respondent.selections[q_index], language)
+            next_button = session.widget("button", get_text("next_question", language))[0]
+            await think()
+            seconds = await session.rerun([
+                (radio_id, "string_value", option_text),
+                (next_button, "trigger_value", True),
+            ], fragment_id)
+            record("answer" if "radio" in session.widgets else "result", seconds)
+
+
+async def run_load(base_url, respondents, args, sampler=None):
+    latencies = {step: [] for step in STEPS}
+    errors = []
+    completed = 0
+    active = peak_active = 0
+    rng = random.Random(args.seed)
+
+    def record(step, seconds):
+        latencies[step].append(seconds)
+
+    async def respondent_task(respondent):
+        nonlocal completed, active, peak_active
+        active += 1
+        peak_active = max(peak_active, active)
+        try:
+            await run_respondent(base_url, respondent, args, record)
+            completed += 1
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            active -= 1
+
+    sampling = asyncio.create_task(sampler.run()) if sampler is not None else None
+    start = time.perf_counter()
+    tasks = []
+    for respondent in respondents:
+        tasks.append(asyncio.create_task(respondent_task(respondent)))
+        if args.rate > 0:
+            await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+    if sampling is not None:
+        sampling.cancel()
+    return latencies, completed, errors, peak_active, seconds
+
+
+class ServerSampler:
+    """Samples a server process's CPU and RSS while the load runs (needs psutil)"""
+
+    def __init__(self, pid, interval=0.25):
+        import psutil
+
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.cpu = []
+        self.rss = []
+        self.process.cpu_percent(None)
+        self.rss_before = self.process.memory_info().rss
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.cpu.append(self.process.cpu_percent(None))
+            self.rss.append(self.process.memory_info().rss)
+
+
+def start_server(port, db_path):
+    env = dict(os.environ, TIME_SPAN_DB=db_path)
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_for_health(http_url, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{http_url}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"app server did not become healthy at {http_url}")
+
+
+def print_report(latencies, completed, errors, peak_active, seconds, sampler, client_cpu, args):
+    print(f"sessions:        {completed} completed, {len(errors)} failed in {seconds:.1f} s "
+          f"({completed / seconds:.2f} sessions/s, peak {peak_active} concurrent)")
+    if args.rate > 0:
+        print(f"arrival rate:    {args.rate:g}/s, think time {args.think_time:g} s")
+    print(f"{'rerun latency':<16} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    everything = [seconds for step in STEPS for seconds in latencies[step]]
+    for step, values in [*latencies.items(), ("all", everything)]:
+        if not values:
+            continue
+        ms = np.array(values) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        print(f"  {step:<14} {len(ms):>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {ms.max():>9.1f}")
+    if sampler is not None and sampler.cpu:
+        mb = 1024 * 1024
+        print(f"server CPU:      mean {np.mean(sampler.cpu):.0f}%, max {max(sampler.cpu):.0f}% (100% = one core)")
+        print(f"server RSS:      {sampler.rss_before / mb:.0f} MB before, peak {max(sampler.rss) / mb:.0f} MB, "
+              f"{sampler.rss[-1] / mb:.0f} MB at end")
+    else:
+        print("server CPU/RSS:  not sampled (needs psutil and the server pid)")
+    print(f"client CPU:      {client_cpu / seconds:.0%} of one core")
+    for message in sorted(set(errors))[:5]:
+        print(f"  error: {message} (x{errors.count(message)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent respondents through the app.")
+    parser.add_argument("--url", help="existing app, e.g. http://127.0.0.1:8501 (default: start one)")
+    parser.add_argument("--pid", type=int, help="pid of the --url server, for CPU/RSS sampling")
+    parser.add_argument("--sessions", type=int, default=100, help="respondents to run")
+    parser.add_argument("--rate", type=float, default=10.0, help="arrivals per second (0 = all at once)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds between clicks")
+    parser.add_argument("--answers", help="recorded answers: CSV/JSONL in bulk_score.py's input format")
+    parser.add_argument("--language", choices=list(LANGUAGES), default="en", help="language of synthetic respondents")
+    parser.add_argument("--adaptive", action="store_true", help="open the app with ?adaptive=1")
+    parser.add_argument("--seed", type=int, default=0, help="seed for synthetic answers, arrivals and think times")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for one rerun")
+    parser.add_argument("--db", default="", help="assessment store for a started server (default: off)")
+    args = parser.parse_args()
+
+    if args.answers:
+        respondents = recorded_respondents(args.answers, args.sessions, args.language)
+    else:
+        respondents = synthetic_respondents(args.sessions, args.seed, args.language)
+    random.seed(args.seed)
+
+    server = None
+    pid = args.pid
+    if args.url:
+        http_url = args.url.rstrip("/")
+    else:
+        port = free_port()
+        http_url = f"http://127.0.0.1:{port}"
+        server = start_server(port, args.db)
+        pid = server.pid
+    url = urlsplit(http_url)
+    base_url = f"{'wss' if url.scheme == 'https' else 'ws'}://{url.netloc}{url.path}"
+    try:
+        wait_for_health(http_url)
+        # Warm-up (imports, chart templates, process caches) is not measured
+        asyncio.run(run_load(base_url, respondents[:1], argparse.Namespace(**{**vars(args), "rate": 0.0,
+                                                                             "think_time": 0.0})))
+        sampler = None
+        if pid is not None:
+            try:
+                sampler = ServerSampler(pid)
+            except ImportError:
+                pass
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_before = usage.ru_utime + usage.ru_stime
+        latencies, completed, errors, peak_active, seconds = asyncio.run(
+            run_load(base_url, respondents, args, sampler))
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        client_cpu = usage.ru_utime + usage.ru_stime - cpu_before
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(latencies, completed, errors, peak_active, seconds, sampler, client_cpu, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/session_memory.py - Memory held per session in st.session_state
+# Run from the repository root: python -m benchmarks.session_memory [--sessions N]
+#
+# Drives one headless session through start -> 12 questions -> result, switches
+# it to Swedish and back, then reports the deep size of every session_state
+# key. Objects the whole process shares are not counted: None/True/False,
+# small ints, classes and functions, and chart figures (charts.py caches one
+# per input; result panels only reference them).
+#
+# It then holds N sessions' answer state at once, once as the loose keys the
+# app used to keep (page, answers list, purpose label, ...) and once as
+# SessionRecord objects, and reports the traced memory per session.
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from types import FunctionType, ModuleType
+
+from plotly.basedatatypes import BaseFigure
+
+from config.languages import get_text
+from scoring import PURPOSE_KEYS
+from scoring.questions import QUESTION_BANK
+from session_record import SessionRecord
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def is_shared(obj):
+    """True for objects that belong to the process rather than to one session"""
+    if obj is None or isinstance(obj, (bool, type, ModuleType, FunctionType, BaseFigure)):
+        return True
+    return type(obj) is int and -5 <= obj <= 256
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes reachable from obj, counting each object once and skipping shared ones"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or is_shared(obj):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        children = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = obj
+    elif isinstance(obj, (str, bytes, bytearray, int, float, complex)):
+        children = ()
+    else:
+        children = [getattr(obj, name) for name in getattr(type(obj), "__slots__", ()) if hasattr(obj, name)]
+        if hasattr(obj, "__dict__"):
+            children.append(obj.__dict__)
+    return size + sum(deep_sizeof(child, seen) for child in children)
+
+
+def legacy_state(selections, purpose_index, language="en"):
+    """The loose session_state keys the app kept before SessionRecord"""
+    return {
+        "page": "result",
+        "answers": list(selections),
+        "current_q": len(selections),
+        "language": language,
+        "cohort": "",
+        "adaptive": False,
+        "purpose": get_text(PURPOSE_KEYS[purpose_index], language),
+        "result_recorded": True,
+    }
+
+
+def compact_state(selections, purpose_index, language="en"):
+    record = SessionRecord(language)
+    record.start(purpose_index)
+    for q_index, option_index in enumerate(selections):
+        record.answer(q_index, option_index)
+    record.page = "result"
+    record.recorded = True
+    return {"record": record}
+
+
+def app_session_sizes():
+    """Deep size of each session_state key after one full session"""
+    os.environ["TIME_SPAN_DB"] = ""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.run()
+    at.button[0].click().run()
+    while at.session_state["record"].page == "questions":
+        at.radio[0].set_value(at.radio[0].options[1])
+        at.button[0].click().run()
+    at.sidebar.selectbox[0].set_value("sv").run()
+    at.sidebar.selectbox[0].set_value("en").run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {key: deep_sizeof(value) for key, value in at.session_state.items()}
+
+
+def traced_per_session(build, sessions, seed=0):
+    """Traced bytes per session while `sessions` states built by build() are alive"""
+    rng = random.Random(seed)
+    inputs = [([rng.randrange(len(q.options["en"])) for q in QUESTION_BANK], rng.randrange(len(PURPOSE_KEYS)))
+              for _ in range(sessions)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [build(selections, purpose_index) for selections, purpose_index in inputs]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del states
+    return used / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report memory held per session.")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--skip-apptest", action="store_true", help="only compare the answer-state layouts")
+    args = parser.parse_args()
+
+    if not args.skip_apptest:
+        sizes = app_session_sizes()
+        print("session_state after one session (deep size, shared objects excluded)")
+        for key, size in sorted(sizes.items(), key=lambda item: -item[1]):
+            print(f"  {key:<22} {size:>10,} B")
+        print(f"  {'total':<22} {sum(sizes.values()):>10,} B")
+        print()
+
+    selections = [1] * len(QUESTION_BANK)
+    print("answer state, one session (deep size)")
+    print(f"  loose keys             {deep_sizeof(legacy_state(selections, 2)):>10,} B")
+    print(f"  SessionRecord          {deep_sizeof(compact_state(selections, 2)):>10,} B")
+    print()
+    print(f"answer state, {args.sessions:,} live sessions (traced per session)")
+    print(f"  loose keys             {traced_per_session(legacy_state, args.sessions):>10,.0f} B")
+    print(f"  SessionRecord          {traced_per_session(compact_state, args.sessions):>10,.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/startup.py - Cold-start cost of the question flow vs. the result page
+# Run from the repository root: python -m benchmarks.startup [--repeat N]
+#
+# Each scenario runs in a fresh interpreter so import caches start cold.
+# "questions" renders the start page and the first question; "result" also
+# answers all 12 questions and renders the result page. The scoring package,
+# which batch workers and the API import on their own, should load in under
+# SCORING_IMPORT_BUDGET_MS without any UI or numeric libraries.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+# Streamlit itself imports plotly.graph_objects to register its chart theme;
+# plotly.express (and the pandas it pulls in) is what the app can defer
+HEAVY_MODULES = ("plotly.express", "pandas")
+SCORING_IMPORT_BUDGET_MS = 50
+SCORING_IMPORT_CHECK = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import scoring\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+    "print(','.join(m for m in ('streamlit', 'plotly', 'pandas', 'numpy') if m in sys.modules))\n"
+)
+
+
+def rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(scenario):
+    # The benchmark must not write to the assessment database
+    os.environ["TIME_SPAN_DB"] = ""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    framework_seconds = time.perf_counter() - start
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    run_start = time.perf_counter()
+    at.run()
+    at.button[0].click().run()
+    questions_seconds = time.perf_counter() - run_start
+    result = {
+        "scenario": scenario,
+        "framework_import_s": round(framework_seconds, 4),
+        "question_flow_s": round(questions_seconds, 4),
+    }
+
+    if scenario == "result":
+        result_start = time.perf_counter()
+        for _ in range(12):
+            at.button[0].click().run()
+        result["result_page_s"] = round(time.perf_counter() - result_start, 4)
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    result["heavy_modules_loaded"] = [name for name in HEAVY_MODULES if name in sys.modules]
+    result["peak_rss_mb"] = round(rss_mb(), 1)
+    print(json.dumps(result))
+
+
+def measure(scenario):
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.startup", "--child", scenario],
+        cwd=os.path.dirname(APP_PATH), stderr=subprocess.DEVNULL, text=True,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def scoring_import():
+    """(milliseconds, heavy modules loaded) for `import scoring` in a fresh interpreter"""
+    output = subprocess.check_output([sys.executable, "-c", SCORING_IMPORT_CHECK],
+                                     cwd=os.path.dirname(APP_PATH), text=True)
+    ms, modules = output.splitlines()
+    return float(ms), [name for name in modules.split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold-start cost of the question flow and the result page.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", choices=["questions", "result"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_scenario(args.child)
+        return
+
+    for scenario in ("questions", "result"):
+        runs = [measure(scenario) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["question_flow_s"])
+        print(f"{scenario}:")
+        print(f"  streamlit import:    {best['framework_import_s'] * 1000:8.1f} ms")
+        print(f"  start + question 1:  {best['question_flow_s'] * 1000:8.1f} ms")
+        if "result_page_s" in best:
+            print(f"  12 answers + result: {best['result_page_s'] * 1000:8.1f} ms")
+        print(f"  peak RSS:            {max(r['peak_rss_mb'] for r in runs):8.1f} MB")
+        print(f"  heavy modules:       {', '.join(best['heavy_modules_loaded']) or 'none'}")
+
+    runs = [scoring_import() for _ in range(args.repeat)]
+    ms = min(run[0] for run in runs)
+    print("scoring package:")
+    print(f"  import:              {ms:8.1f} ms (budget {SCORING_IMPORT_BUDGET_MS} ms"
+          f"{'' if ms < SCORING_IMPORT_BUDGET_MS else ', OVER BUDGET'})")
+    print(f"  heavy modules:       {', '.join(runs[0][1]) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# benchmarks/suite.py - Timings for every hot path, saved as JSON per commit
+# Run from the repository root:
+#   python -m benchmarks.suite                      # writes benchmarks/results/<commit>.json
+#   python -m benchmarks.suite --quick -o out.json
+#   python -m benchmarks.suite --compare before.json after.json
+#
+# Function benchmarks call the scoring/export/chart code directly; "apptest"
+# benchmarks time full-script reruns of the question and result pages with
+# Streamlit's headless AppTest. Per-call times are the median (and best) of
+# several samples, each long enough to swamp timer overhead.
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "main.py")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def time_call(fn, repeat=5, min_sample_s=0.02):
+    """Median and best seconds per call of fn()"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_sample_s:
+            break
+        loops *= 2
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return {"median_us": statistics.median(samples) * 1e6, "min_us": min(samples) * 1e6, "loops": loops}
+
+
+def function_benchmarks(repeat):
+    from charts import (category_figure, distribution_figure, gauge_figure,
+                        _category_skeleton, _distribution_skeleton, _gauge_skeleton)
+    from config.languages import get_text
+    from scoring.exports import encode_csv, encode_json, export_bytes
+    from scoring import (analyze_by_category, calculate_average_level, generate_csv_data, generate_json_data,
+                         generate_summary_report, get_strength_weakness_analysis, interpret_level)
+    from scoring.questions import answer_levels
+    from result_cache import compute_result
+
+    language = "en"
+    purpose = get_text("purpose_recruitment", language)
+    selections = [i % 3 for i in range(12)]
+    answers = answer_levels(selections)
+    avg_level = calculate_average_level(answers)
+    summary, description = interpret_level(avg_level, purpose, language)
+    category_averages = analyze_by_category(answers, language)
+    csv_data = generate_csv_data(selections, avg_level, purpose, language)
+    json_data = generate_json_data(selections, avg_level, purpose, language)
+    counts = {}
+    for level in answers:
+        counts[level] = counts.get(level, 0) + 1
+    levels, level_counts = tuple(counts), tuple(counts.values())
+    categories, scores = tuple(category_averages), tuple(category_averages.values())
+    for skeleton in (_gauge_skeleton, _distribution_skeleton, _category_skeleton):
+        skeleton(language)
+
+    cases = {
+        "get_text": lambda: get_text("stratum_desc_4", language),
+        "get_text_sv": lambda: get_text("stratum_desc_4", "sv"),
+        "interpret_level": lambda: interpret_level(avg_level, purpose, language),
+        "analyze_by_category": lambda: analyze_by_category(answers, language),
+        "get_strength_weakness_analysis": lambda: get_strength_weakness_analysis(category_averages),
+        "generate_csv_data": lambda: generate_csv_data(selections, avg_level, purpose, language),
+        "generate_json_data": lambda: generate_json_data(selections, avg_level, purpose, language),
+        "generate_summary_report": lambda: generate_summary_report(answers, avg_level, summary, description,
+                                                                   purpose, language),
+        "compute_result": lambda: compute_result(selections, language, purpose),
+        # create_download_link() became on-demand export_bytes(); encode_* is the uncached path
+        "encode_csv": lambda: encode_csv(csv_data),
+        "encode_json": lambda: encode_json(json_data),
+        "export_bytes_cached": lambda: export_bytes(csv_data, "csv"),
+        # __wrapped__ skips the per-result figure cache: skeleton copy + new Figure
+        "gauge_figure": lambda: gauge_figure.__wrapped__(avg_level, language),
+        "distribution_figure": lambda: distribution_figure.__wrapped__(levels, level_counts, language),
+        "category_figure": lambda: category_figure.__wrapped__(categories, scores, language),
+        "gauge_figure_cached": lambda: gauge_figure(avg_level, language),
+        "gauge_skeleton_build": lambda: _gauge_skeleton.__wrapped__(language),
+        "category_skeleton_build": lambda: _category_skeleton.__wrapped__(language),
+    }
+    results = {}
+    for name, fn in cases.items():
+        results[name] = time_call(fn, repeat=repeat)
+        print(f"  {name:<34} {results[name]['median_us']:12.2f} us", file=sys.stderr)
+    return results
+
+
+def _rerun_stats(samples):
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "min_ms": min(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+        "runs": len(samples),
+    }
+
+
+def apptest_benchmarks(reruns):
+    # The benchmark must not write to the assessment database
+    os.environ["TIME_SPAN_DB"] = ""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - start
+    at.button[0].click().run()
+
+    # Question page: changing the selected option reruns the whole script
+    samples = []
+    for i in range(reruns):
+        radio = at.radio[0]
+        value = radio.options.index(radio.value) if radio.value in radio.options else 0
+        start = time.perf_counter()
+        radio.set_value((value + 1) % len(radio.options)).run()
+        samples.append(time.perf_counter() - start)
+    question_page = _rerun_stats(samples)
+
+    samples = []
+    for _ in range(12):
+        start = time.perf_counter()
+        at.button[0].click().run()
+        samples.append(time.perf_counter() - start)
+    answer_question = _rerun_stats(samples)
+
+    # Result page: plain reruns after the first render
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    result_page = _rerun_stats(samples)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    results = {
+        "apptest_first_run": {"median_ms": first_run * 1000, "runs": 1},
+        "apptest_question_rerun": question_page,
+        "apptest_answer_and_next": answer_question,
+        "apptest_result_rerun": result_page,
+    }
+    for name, stats in results.items():
+        print(f"  {name:<34} {stats['median_ms']:12.2f} ms", file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _headline(stats):
+    return stats.get("median_us", stats.get("median_ms", 0) * 1000)
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'benchmark':<34} {before['commit']:>12} {after['commit']:>12}   change")
+    for name, stats in after["results"].items():
+        if name not in before["results"]:
+            print(f"{name:<34} {'-':>12} {_headline(stats):12.1f}")
+            continue
+        old, new = _headline(before["results"][name]), _headline(stats)
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{name:<34} {old:12.1f} {new:12.1f}   {change:+6.1f}%")
+    print("(times in microseconds, median per call or rerun)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths and save the results as JSON.")
+    parser.add_argument("-o", "--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--quick", action="store_true", help="fewer samples and reruns")
+    parser.add_argument("--skip-apptest", action="store_true", help="function benchmarks only")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.chdir(ROOT)
+    repeat, reruns = (3, 5) if args.quick else (7, 20)
+    results = function_benchmarks(repeat)
+    if not args.skip_apptest:
+        results.update(apptest_benchmarks(reruns))
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(results)} benchmarks to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# bulk_score.py - Headless bulk scorer for exported responses
+#
+# Usage:
+#   python bulk_score.py responses.csv -o results.jsonl --workers 4 --chunk-size 1000
+#
+# Input rows need 12 answers and optionally a respondent id, purpose,
+# language and ISO completion time. Answers are stratum levels, or option
+# indices under "options":
+#   CSV:   id,purpose,language,completed_at,q1,...,q12
+#   JSONL: {"id": ..., "purpose": ..., "language": ..., "answers": [12 levels]}
+#   JSONL: {"id": ..., "options": [12 option indices]}
+#
+# Each output line has the same fields as generate_json_data(). Streamlit and
+# Plotly are never imported, so this can run on plain batch workers.
+#
+# With --format parquet/arrow the output is instead one language-neutral,
+# typed row per response (see columnar_export.py; needs pyarrow from
+# requirements-tools.txt):
+#   python bulk_score.py responses.jsonl --format parquet -o results.parquet
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+from config.languages import LANGUAGES, get_text
+from scoring import (
+    PURPOSE_KEYS,
+    QUESTION_BANK,
+    answer_levels,
+    calculate_average_level,
+    generate_json_data,
+    purpose_id,
+    selections_for_levels,
+)
+
+
+def _column_int(value):
+    """An answer from a q1..q12 field: an integer, or decimal text in CSV rows"""
+    if isinstance(value, str):
+        return int(value)
+    if type(value) is not int:
+        raise TypeError(f"{value!r} is not an integer")
+    return value
+
+
+def parse_response(record, where, default_language, default_purpose):
+    """Validate one raw input record and return (id, selections, purpose, language, completed_at)
+
+    where (e.g. "line 3") prefixes error messages. purpose may be localized
+    text or one of scoring.PURPOSE_KEYS.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: expected an object, got {type(record).__name__}")
+    by_option = record.get("options") is not None
+    answers = record.get("options") if by_option else record.get("answers")
+    if answers is None:
+        try:
+            answers = [_column_int(record.get(f"q{i + 1}")) for i in range(len(QUESTION_BANK))]
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: answers must be {len(QUESTION_BANK)} integers")
+    # JSON answers must be real integers: no text, floats or booleans
+    elif not isinstance(answers, list) or not all(type(value) is int for value in answers):
+        raise ValueError(f"{where}: answers must be a list of {len(QUESTION_BANK)} integers")
+    if len(answers) != len(QUESTION_BANK):
+        raise ValueError(f"{where}: expected {len(QUESTION_BANK)} answers, got {len(answers)}")
+
+    if by_option:
+        for question, option_index in zip(QUESTION_BANK, answers):
+            if not 0 <= option_index < len(question):
+                raise ValueError(f"{where}: question {question.number} has no option {option_index}")
+        selections = answers
+    else:
+        try:
+            selections = selections_for_levels(answers)
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}")
+
+    language = record.get("language") or default_language
+    if not isinstance(language, str) or language not in LANGUAGES:
+        raise ValueError(f"{where}: unknown language {language!r}")
+    purpose = record.get("purpose") or default_purpose
+    if not isinstance(purpose, str):
+        raise ValueError(f"{where}: purpose must be text")
+    if purpose in PURPOSE_KEYS:
+        purpose = get_text(purpose, language)
+
+    completed_at = record.get("completed_at") or None
+    if completed_at is not None:
+        try:
+            completed_at = datetime.fromisoformat(completed_at)
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: completed_at must be an ISO date/time")
+    return record.get("id"), selections, purpose, language, completed_at
+
+
+def _json_line(line, line_number):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"line {line_number}: invalid JSON: {e.msg} (column {e.pos + 1})")
+
+
+def read_responses(path, default_language, default_purpose):
+    """Stream parsed responses from a CSV or JSONL file"""
+    is_csv = os.path.splitext(path)[1].lower() == ".csv"
+    with open(path, newline="", encoding="utf-8") as f:
+        if is_csv:
+            records = csv.DictReader(f)
+            # Header is line 1
+            numbered = enumerate(records, start=2)
+        else:
+            numbered = ((n, _json_line(line, n)) for n, line in enumerate(f, start=1) if line.strip())
+        for line_number, record in numbered:
+            yield parse_response(record, f"line {line_number}", default_language, default_purpose)
+
+
+def score_chunk(chunk):
+    """Score a list of parsed responses (runs in a worker process)"""
+    results = []
+    for respondent_id, selections, purpose, language, completed_at in chunk:
+        avg_level = calculate_average_level(answer_levels(selections))
+        # Rows without a completion time are stamped with the time they are scored
+        data = generate_json_data(selections, avg_level, purpose, language, completed_at)
+        if respondent_id is not None:
+            data = {"respondent_id": respondent_id, **data}
+        results.append(data)
+    return results
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_stream(responses, workers, chunk_size):
+    """Yield scored results in input order, keeping at most 2 chunks per worker in flight"""
+    if workers <= 1:
+        for chunk in chunked(responses, chunk_size):
+            yield from score_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunked(responses, chunk_size):
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def columnar_records(responses):
+    """Map parsed responses to columnar_export records"""
+    for respondent_id, selections, purpose, language, completed_at in responses:
+        yield respondent_id, completed_at, purpose_id(purpose, language), selections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score exported Time Span Estimator responses in bulk.")
+    parser.add_argument("input", help="CSV or JSONL file with one response per row")
+    parser.add_argument("-o", "--output", help="output file (default: stdout, JSONL only)")
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "parquet", "arrow"],
+                        help="jsonl: generate_json_data documents; parquet/arrow: typed columns")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (1 scores in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="responses per worker task")
+    parser.add_argument("--row-group-size", type=int, default=65536,
+                        help="rows per Parquet row group / Arrow record batch")
+    parser.add_argument("--language", default="en", choices=list(LANGUAGES.keys()),
+                        help="language for rows without one")
+    parser.add_argument("--purpose", default="purpose_self",
+                        choices=PURPOSE_KEYS,
+                        help="purpose for rows without one")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.row_group_size < 1:
+        parser.error("--row-group-size must be at least 1")
+    if args.format != "jsonl":
+        if not args.output:
+            parser.error(f"--format {args.format} needs --output")
+        return write_columnar_output(parser, args)
+
+    try:
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    except OSError as e:
+        parser.exit(1, f"bulk_score: {e}\n")
+    count = 0
+    try:
+        responses = read_responses(args.input, args.language, args.purpose)
+        for data in score_stream(responses, args.workers, args.chunk_size):
+            out.write(json.dumps(data, ensure_ascii=False) + "\n")
+            count += 1
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"bulk_score: {e}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Scored {count} responses", file=sys.stderr)
+
+
+def write_columnar_output(parser, args):
+    # Imported here so JSONL runs never load pandas/pyarrow
+    try:
+        from columnar_export import write_columnar
+    except ImportError as e:
+        parser.exit(1, f"bulk_score: --format {args.format} needs {e.name} (pip install -r requirements-tools.txt)\n")
+
+    try:
+        responses = read_responses(args.input, args.language, args.purpose)
+        count = write_columnar(columnar_records(responses), args.output, args.format, args.row_group_size)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"bulk_score: {e}\n")
+    print(f"Wrote {count} responses to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
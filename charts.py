@@ -0,0 +1,124 @@
+# charts.py - Result-page figures built from per-language skeletons
+#
+# Only the data changes between results: the layout, colour steps, axis
+# labels and titles depend on the language alone. Each chart's skeleton is
+# built with Plotly once per language and kept as a plain dict; a result's
+# figure is the skeleton with its data patched in, cached per unique result.
+# The skeleton was validated when it was built and only data values change,
+# so result figures skip Plotly's property validation (about 9 ms -> 0.7 ms).
+# Cached figures are shared between sessions and must be treated as read-only.
+import copy
+from functools import lru_cache
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from config.languages import get_text
+
+FIGURE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _gauge_skeleton(language):
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = 0,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': get_text("stratum_level", language)},
+        delta = {'reference': 4},
+        gauge = {
+            'axis': {'range': [None, 7]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 1], 'color': "lightgray"},
+                {'range': [1, 2], 'color': "lightblue"},
+                {'range': [2, 3], 'color': "lightgreen"},
+                {'range': [3, 4], 'color': "yellow"},
+                {'range': [4, 5], 'color': "orange"},
+                {'range': [5, 6], 'color': "red"},
+                {'range': [6, 7], 'color': "darkred"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 7
+            }
+        }
+    ))
+    fig.update_layout(height=400)
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _distribution_skeleton(language, count_key="number_of_answers", title_key="distribution_title"):
+    fig = px.bar(
+        x=[0],
+        y=[0],
+        labels={'x': get_text('stratum_level_label', language), 'y': get_text(count_key, language)},
+        title=get_text(title_key, language),
+        color=[0],
+        color_continuous_scale="viridis"
+    )
+    fig.update_layout(height=400)
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=None)
+def _category_skeleton(language):
+    fig = px.bar(
+        x=[""],
+        y=[0.0],
+        labels={'x': get_text('category_label', language), 'y': get_text('average_stratum_level', language)},
+        title=get_text("category_performance_title", language),
+        color=[0.0],
+        color_continuous_scale="RdYlGn"
+    )
+    fig.update_layout(height=400, xaxis_tickangle=-45)
+    return fig.to_dict()
+
+
+def _figure(spec):
+    """Figure from a patched skeleton, without re-validating every property"""
+    return go.Figure(spec, _validate=False)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def gauge_figure(avg_level, language="en"):
+    """Gauge of the final stratum level"""
+    spec = copy.deepcopy(_gauge_skeleton(language))
+    spec["data"][0]["value"] = avg_level
+    return _figure(spec)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def distribution_figure(levels, counts, language="en"):
+    """Bar chart of how many answers fell on each level (tuples, in first-seen order)"""
+    spec = copy.deepcopy(_distribution_skeleton(language))
+    trace = spec["data"][0]
+    trace["x"] = list(levels)
+    trace["y"] = list(counts)
+    trace["marker"]["color"] = list(levels)
+    return _figure(spec)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def cohort_distribution_figure(levels, counts, language="en"):
+    """Bar chart of how many respondents in a cohort ended on each stratum"""
+    spec = copy.deepcopy(_distribution_skeleton(language, "number_of_respondents", "cohort_stratum_distribution"))
+    trace = spec["data"][0]
+    trace["x"] = list(levels)
+    trace["y"] = list(counts)
+    trace["marker"]["color"] = list(levels)
+    return _figure(spec)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def category_figure(categories, scores, language="en"):
+    """Bar chart of average level per category (tuples, in category order)"""
+    spec = copy.deepcopy(_category_skeleton(language))
+    trace = spec["data"][0]
+    trace["x"] = list(categories)
+    trace["y"] = list(scores)
+    trace["marker"]["color"] = list(scores)
+    return _figure(spec)
+
@@ -0,0 +1,114 @@
+# cohort_dashboard.py - Team view over stored assessments
+#
+# Reached with ?view=team (optionally &cohort=<group>). Counts and means come
+# from the cohort_rollups table and spreads from the store's in-memory
+# streaming aggregates, so a rerun costs the same at 100 or 100k respondents.
+#
+# Access needs &token=<token> from TIME_SPAN_TEAM_TOKENS, a comma-separated
+# list: "<token>" sees every group, "<cohort>=<token>" only that cohort. With
+# the variable unset the team view is turned off.
+import hmac
+import os
+
+import streamlit as st
+
+from assessment_store import get_store
+from charts import cohort_distribution_figure, category_figure
+from config.languages import get_text
+from scoring import PURPOSE_KEYS, analyze_by_category
+
+TOKENS_ENV = "TIME_SPAN_TEAM_TOKENS"
+
+
+def allowed_cohorts(token):
+    """Cohorts a team-view token may see: None for all, else a (possibly empty) set"""
+    allowed = set()
+    if not token:
+        return allowed
+    for entry in os.environ.get(TOKENS_ENV, "").split(","):
+        cohort, scoped, expected = entry.strip().rpartition("=")
+        if expected and hmac.compare_digest(expected.encode(), token.encode()):
+            if not scoped:
+                return None
+            allowed.add(cohort)
+    return allowed
+
+
+def render_cohort_dashboard(language):
+    """Render the team view page"""
+    st.title(get_text("cohort_title", language))
+
+    allowed = allowed_cohorts(st.query_params.get("token", ""))
+    if allowed is not None and not allowed:
+        st.error(get_text("cohort_access_denied", language))
+        return
+
+    store = get_store()
+    if store is None:
+        st.info(get_text("cohort_store_disabled", language))
+        return
+
+    cohorts = [None] + store.cohorts() if allowed is None else sorted(allowed)
+    requested = st.query_params.get("cohort")
+    cohort = st.selectbox(
+        get_text("cohort_select", language),
+        cohorts,
+        index=cohorts.index(requested) if requested in cohorts else 0,
+        format_func=lambda c: get_text("cohort_all", language) if c is None else (c or "—"),
+    )
+
+    rollup = store.cohort_rollup(cohort)
+    respondents = rollup["respondents"]
+    if not respondents:
+        st.info(get_text("cohort_no_data", language))
+        return
+
+    stratum_counts = rollup["stratum_counts"]
+    average_stratum = sum(stratum * n for stratum, n in stratum_counts.items()) / respondents
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(get_text("cohort_respondents", language), f"{respondents:,}")
+    with col2:
+        st.metric(get_text("cohort_average_stratum", language), f"{average_stratum:.1f}")
+
+    try:
+        fig_distribution = cohort_distribution_figure(
+            tuple(stratum_counts.keys()), tuple(stratum_counts.values()), language
+        )
+        st.plotly_chart(fig_distribution, width="stretch")
+    except Exception as e:
+        st.error(f"Chart could not be displayed: {e}")
+        st.write(stratum_counts)
+
+    # Mean level per question averages to the same per-category figures as
+    # averaging each respondent's analyze_by_category() result
+    st.markdown(f"### {get_text('cohort_category_averages', language)}")
+    category_averages = analyze_by_category(rollup["question_means"], language)
+    try:
+        fig_category = category_figure(
+            tuple(category_averages.keys()), tuple(category_averages.values()), language
+        )
+        st.plotly_chart(fig_category, width="stretch")
+    except Exception as e:
+        st.error(f"Category chart could not be displayed: {e}")
+
+    # Spread comes from the store's streaming aggregates (available once seeded)
+    if store.aggregates_ready.is_set():
+        spread = store.aggregates.summary(cohort)["categories"]
+        st.markdown(f"#### {get_text('cohort_category_spread', language)}")
+        rows = [
+            f"| {get_text('category_label', language)} | {get_text('average_stratum_level', language)} "
+            f"| {get_text('cohort_std_dev', language)} |",
+            "|---|---:|---:|",
+        ]
+        for key, stats in spread.items():
+            if stats["count"]:
+                rows.append(f"| {get_text(key, language)} | {stats['mean']:.2f} | {stats['std']:.2f} |")
+        st.markdown("\n".join(rows))
+
+    st.markdown(f"### {get_text('cohort_purpose_breakdown', language)}")
+    purposes = rollup["purposes"]
+    cols = st.columns(len(purposes))
+    for col, (purpose, (n, mean_stratum)) in zip(cols, sorted(purposes.items(), key=lambda p: (p[0] is None, p[0]))):
+        label = get_text("cohort_purpose_other", language) if purpose is None else get_text(PURPOSE_KEYS[purpose], language)
+        col.metric(label, f"{n:,}", help=f"{get_text('cohort_average_stratum', language)}: {mean_stratum:.1f}")
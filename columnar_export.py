@@ -0,0 +1,98 @@
+# columnar_export.py - Language-neutral Parquet/Arrow export of many assessments
+#
+# One row per assessment with typed columns only (no localized labels):
+#   respondent_id  string
+#   completed_at   timestamp[us] (times with a UTC offset are converted to UTC)
+#   purpose_id     uint8 (index into scoring.PURPOSE_KEYS, null for free text)
+#   q1 ... q12     uint8 answer levels
+#   final_stratum  uint8
+#
+# Records are consumed in batches of batch_size and each batch is written as
+# one row group (Parquet) or record batch (Arrow IPC), so memory stays flat no
+# matter how many assessments are exported. The file is written under a
+# temporary name and only moved to path once every record was written, so a
+# failed export never leaves a valid-looking partial file behind.
+import os
+from datetime import datetime, timezone
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scoring.batch import levels_from_options, stratum_levels
+from scoring.questions import QUESTION_BANK
+
+ANSWER_COLUMNS = [f"q{i + 1}" for i in range(len(QUESTION_BANK))]
+
+SCHEMA = pa.schema(
+    [
+        ("respondent_id", pa.string()),
+        ("completed_at", pa.timestamp("us")),
+        ("purpose_id", pa.uint8()),
+    ]
+    + [(column, pa.uint8()) for column in ANSWER_COLUMNS]
+    + [("final_stratum", pa.uint8())]
+)
+
+FORMATS = ("parquet", "arrow")
+
+
+def naive_timestamp(completed_at):
+    """completed_at without tzinfo: offset-aware times in UTC, missing ones as now"""
+    if completed_at is None:
+        return datetime.now()
+    if completed_at.tzinfo is not None:
+        return completed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return completed_at
+
+
+def records_to_frame(records):
+    """Build a typed DataFrame from (respondent_id, completed_at, purpose_id, selections) records"""
+    respondent_ids, completed_at, purpose_ids, selections = zip(*records)
+    levels = levels_from_options(np.array(selections, dtype=np.int64)).astype(np.uint8)
+
+    frame = pd.DataFrame({
+        "respondent_id": pd.array([None if r is None else str(r) for r in respondent_ids], dtype="string"),
+        "completed_at": pd.to_datetime([naive_timestamp(c) for c in completed_at]).astype("datetime64[us]"),
+        "purpose_id": pd.array(purpose_ids, dtype="UInt8"),
+    })
+    for i, column in enumerate(ANSWER_COLUMNS):
+        frame[column] = levels[:, i]
+    frame["final_stratum"] = stratum_levels(levels).astype(np.uint8)
+    return frame
+
+
+def write_columnar(records, path, file_format="parquet", batch_size=65536):
+    """Stream records into a Parquet or Arrow IPC file; return the number of rows"""
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {FORMATS}, got '{file_format}'")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(tmp_path, SCHEMA)
+    else:
+        writer = pa.ipc.new_file(tmp_path, SCHEMA)
+
+    rows = 0
+    records = iter(records)
+    try:
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                table = pa.Table.from_pandas(records_to_frame(batch), schema=SCHEMA, preserve_index=False)
+                writer.write_table(table)
+                rows += len(batch)
+        finally:
+            writer.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return rows
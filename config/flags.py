@@ -0,0 +1,16 @@
+# On/off switches set by environment variables and URL query parameters
+import os
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def truthy(value):
+    """True for 1/true/yes/on, in any case and ignoring surrounding spaces"""
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def flag_enabled(env_var, query_params=None, query_flag=None):
+    """True when the environment variable or the query flag turns the switch on"""
+    if truthy(os.environ.get(env_var, "")):
+        return True
+    return query_params is not None and query_flag is not None and truthy(query_params.get(query_flag, ""))
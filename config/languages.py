@@ -4,17 +4,40 @@ LANGUAGES = {
     "sv": "Svenska"
 }
 
-# Import all translation files
-from translations.en import ENGLISH_TEXTS
-from translations.sv import SWEDISH_TEXTS
+import threading
 
-TEXTS = {
-    "en": ENGLISH_TEXTS,
-    "sv": SWEDISH_TEXTS
+from translations.catalog import load_catalog
+
+# Translation source modules, compiled to binary catalogs on first use.
+# Adding a language here costs nothing until someone selects it.
+TRANSLATION_SOURCES = {
+    "en": ("translations.en", "ENGLISH_TEXTS"),
+    "sv": ("translations.sv", "SWEDISH_TEXTS")
 }
 
+_catalogs = {}
+_catalog_lock = threading.Lock()
+# {language: Catalog.texts}, the strings decoded so far, for get_text's fast path
+_texts = {}
+
+def get_catalog(language):
+    """Return the loaded catalog for a language, loading it on first use"""
+    catalog = _catalogs.get(language)
+    if catalog is None:
+        with _catalog_lock:
+            catalog = _catalogs.get(language)
+            if catalog is None:
+                module_name, attribute = TRANSLATION_SOURCES[language]
+                catalog = load_catalog(language, module_name, attribute)
+                _texts[language] = catalog.texts
+                _catalogs[language] = catalog
+    return catalog
+
 def get_text(key, language=None):
     """Get text in the specified language"""
     if language is None:
         language = "en"  # Default to English
-    return TEXTS[language].get(key, key) 
\ No newline at end of file
+    try:
+        return _texts[language][key]
+    except KeyError:
+        return get_catalog(language).get(key, key)
@@ -1,290 +1,225 @@
 # main.py - Time Span Estimator
+import time
+
+_run_started = time.perf_counter()
+
 import sys
-import subprocess
-import importlib.util
-import os
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import json
-import csv
 from datetime import datetime
-import base64
 
 # Import multi-language support
+from assessment_store import get_store
 from config.languages import LANGUAGES, get_text
-from questions_multilingual import QUESTIONS_MULTILINGUAL
-
-def read_requirements():
-    """Read requirements from requirements.txt if it exists"""
-    requirements = []
-    if os.path.exists('requirements.txt'):
-        with open('requirements.txt', 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Extract package name (remove version specifiers)
-                    package = line.split('>=')[0].split('<=')[0].split('==')[0].split('!=')[0].split('~=')[0]
-                    requirements.append(package.strip())
-    return requirements
-
-def check_and_install_requirements():
-    """Check and install required packages"""
-    # Get requirements from file or use default
-    required_packages = read_requirements()
-    if not required_packages:
-        required_packages = ['streamlit']  # fallback
-    
-    missing_packages = []
-    
-    for package in required_packages:
-        if importlib.util.find_spec(package) is None:
-            missing_packages.append(package)
-    
-    if missing_packages:
-        print("Installing missing packages...")
-        for package in missing_packages:
-            try:
-                print(f"Installing {package}...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"Successfully installed {package}")
-            except subprocess.CalledProcessError:
-                print(f"Failed to install {package}. Please install it manually: pip install {package}")
-                return False
-        print("All packages installed successfully!")
-    return True
+from preflight import ensure_requirements
+from result_cache import ResultCache, result_panel
+from rerun_profiler import start_run
+from scoring import (
+    MIME_TYPES,
+    PURPOSE_KEYS,
+    QUESTION_BANK,
+    consistency_key,
+    development_note_key,
+    export_bytes,
+    generate_csv_data,
+    generate_json_data,
+    generate_summary_report,
+    language_bundle,
+    leadership_focus_key,
+    roadmap_keys,
+    strength_note_key,
+)
+from session_record import SessionRecord, adaptive_enabled
 
 # Check and install requirements before importing streamlit
-if not check_and_install_requirements():
+_preflight_started = time.perf_counter()
+if not ensure_requirements():
     sys.exit(1)
+_streamlit_import_started = time.perf_counter()
 
 import streamlit as st
 
-# Embedded logic functions from logic.py
-def calculate_average_level(levels):
-    """Calculate average stratum level (rounded to nearest int)"""
-    if not levels:
-        return 0
-    return round(sum(levels) / len(levels))
+# Setup
+st.set_page_config(page_title="Time Span Estimator", layout="centered")
+# Timed spans per run, only with TIME_SPAN_PROFILE=1 or ?profile=1
+profiler = start_run(_run_started, st.query_params)
+profiler.add("imports", _run_started, _preflight_started)
+profiler.add("preflight", _preflight_started, _streamlit_import_started)
+profiler.add("import streamlit", _streamlit_import_started, time.perf_counter())
+# The Next click that finished the questions ran just before this run
+if "answer_timing" in st.session_state:
+    profiler.add("answer_question", *st.session_state.pop("answer_timing"))
+if "record" not in st.session_state:
+    # Page, language, purpose and answers in one compact object per session.
+    # Group links carry ?cohort=<group> so results roll up per team; adaptive
+    # mode asks the most informative questions and stops early.
+    st.session_state.record = SessionRecord(
+        cohort=st.query_params.get("cohort", ""),
+        adaptive=adaptive_enabled(st.query_params),
+    )
+record = st.session_state.record
 
-def interpret_level(level, purpose, language="en"):
-    """Return short summary and description based on level and use case"""
-    stratum_ranges = {
-        1: (get_text("stratum_1", language), get_text("stratum_desc_1", language)),
-        2: (get_text("stratum_2", language), get_text("stratum_desc_2", language)),
-        3: (get_text("stratum_3", language), get_text("stratum_desc_3", language)),
-        4: (get_text("stratum_4", language), get_text("stratum_desc_4", language)),
-        5: (get_text("stratum_5", language), get_text("stratum_desc_5", language)),
-        6: (get_text("stratum_6", language), get_text("stratum_desc_6", language)),
-        7: (get_text("stratum_7", language), get_text("stratum_desc_7", language))
-    }
+# Language selector (always visible)
+with profiler.span("sidebar"):
+    language = st.sidebar.selectbox("🌐 Language / Språk", list(LANGUAGES.keys()), format_func=lambda x: LANGUAGES[x], key="language_selector")
+if language != record.language:
+    record.language = language
+    st.rerun()
 
-    summary, description = stratum_ranges.get(level, ("Undefined", "No clear interpretation."))
 
-    if purpose == get_text("purpose_recruitment", language):
-        description += get_text("purpose_add_recruitment", language)
-    elif purpose == get_text("purpose_leadership", language):
-        description += get_text("purpose_add_leadership", language)
-    elif purpose == get_text("purpose_self", language):
-        description += get_text("purpose_add_self", language)
+def record_answer(record):
+    """Record the selected option and move to the next question or the result"""
+    q_index = record.current_q
+    # The radio's own state is not needed once its answer is in the record
+    record.answer(q_index, st.session_state.pop(f"q_{q_index}"))
+    if record.adaptive:
+        # numpy is loaded only by sessions that run adaptively
+        from adaptive import default_plan
 
-    return summary, description
+        plan = default_plan()
+        selections = record.selections
+        if plan.is_done(selections):
+            record.page = "result"
+        else:
+            record.current_q = plan.next_question(selections)
+        return
+    record.current_q += 1
+    if record.current_q >= len(QUESTION_BANK):
+        record.page = "result"
 
-# Export functions
-def categorize_questions(language="en"):
-    """Define categories for each question"""
-    return {
-        0: get_text("category_project_planning", language),
-        1: get_text("category_problem_solving", language), 
-        2: get_text("category_strategic_planning", language),
-        3: get_text("category_success_definition", language),
-        4: get_text("category_leadership", language),
-        5: get_text("category_organizational_change", language),
-        6: get_text("category_team_design", language),
-        7: get_text("category_mentoring", language),
-        8: get_text("category_role_adaptation", language),
-        9: get_text("category_service_design", language),
-        10: get_text("category_strategy_contribution", language),
-        11: get_text("category_success_evaluation", language)
-    }
 
-def analyze_by_category(answers, language="en"):
-    """Analyze answers by category and identify strengths/weaknesses"""
-    categories = categorize_questions(language)
-    category_scores = {}
-    
-    for i, answer in enumerate(answers):
-        category = categories[i]
-        if category not in category_scores:
-            category_scores[category] = []
-        category_scores[category].append(answer)
-    
-    # Calculate average for each category
-    category_averages = {}
-    for category, scores in category_scores.items():
-        category_averages[category] = sum(scores) / len(scores)
-    
-    return category_averages
+def answer_question():
+    """Next-button callback: record the selected option and move on"""
+    started = time.perf_counter()
+    record_answer(st.session_state.record)
+    if profiler.enabled:
+        # Reported by the rerun this click triggers
+        st.session_state.answer_timing = (started, time.perf_counter())
 
-def get_strength_weakness_analysis(category_averages):
-    """Identify strongest and weakest categories"""
-    sorted_categories = sorted(category_averages.items(), key=lambda x: x[1], reverse=True)
-    
-    strengths = sorted_categories[:3]  # Top 3
-    weaknesses = sorted_categories[-3:]  # Bottom 3
-    
-    return strengths, weaknesses
 
-def generate_csv_data(answers, avg_level, purpose, language="en"):
-    """Generate CSV data for export"""
-    csv_data = []
-    
-    # Add header
-    csv_data.append(["Question", "Category", "Your Answer Level", "Selected Option"])
-    
-    # Add question data
-    categories = categorize_questions(language)
-    for i, (question, answer_level) in enumerate(zip(QUESTIONS_MULTILINGUAL, answers)):
-        option_index = question['levels'].index(answer_level)
-        csv_data.append([
-            f"Question {i+1}",
-            categories[i],
-            f"Stratum {answer_level}",
-            question['options'][language][option_index]
-        ])
-    
-    # Add summary data
-    csv_data.append([])
-    csv_data.append(["Summary", "Value"])
-    csv_data.append(["Final Stratum Level", f"Level {avg_level}"])
-    csv_data.append(["Assessment Purpose", purpose])
-    csv_data.append(["Date Completed", datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-    csv_data.append(["Total Questions", len(answers)])
-    csv_data.append(["Average Score", f"{sum(answers)/len(answers):.1f}"])
-    
-    return csv_data
+def step_profiler():
+    """The script run's profiler, or a new one when only the question fragment reruns"""
+    # A fragment rerun sees the previous full run's (finished) profiler
+    if not profiler.finished:
+        return profiler
+    timing = st.session_state.pop("answer_timing", None)
+    fragment_profiler = start_run(timing[0] if timing else time.perf_counter(), st.query_params)
+    if timing:
+        fragment_profiler.add("answer_question", *timing)
+    return fragment_profiler
 
-def generate_json_data(answers, avg_level, purpose, language="en"):
-    """Generate JSON data for export"""
-    categories = categorize_questions(language)
-    
-    data = {
-        "assessment_info": {
-            "date_completed": datetime.now().isoformat(),
-            "purpose": purpose,
-            "total_questions": len(answers),
-            "final_stratum_level": avg_level,
-            "average_score": round(sum(answers)/len(answers), 1)
-        },
-        "answers": []
-    }
-    
-    for i, (question, answer_level) in enumerate(zip(QUESTIONS_MULTILINGUAL, answers)):
-        option_index = question['levels'].index(answer_level)
-        data["answers"].append({
-            "question_number": i + 1,
-            "category": categories[i],
-            "question_text": question['text'][language],
-            "answer_level": answer_level,
-            "selected_option": question['options'][language][option_index]
-        })
-    
-    return data
-
-def create_download_link(data, filename, file_type):
-    """Create a download link for the data"""
-    if file_type == "csv":
-        csv_string = "\n".join([",".join([str(cell) for cell in row]) for row in data])
-        b64 = base64.b64encode(csv_string.encode()).decode()
-        href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV File</a>'
-    elif file_type == "json":
-        json_string = json.dumps(data, indent=2)
-        b64 = base64.b64encode(json_string.encode()).decode()
-        href = f'<a href="data:application/json;base64,{b64}" download="{filename}">Download JSON File</a>'
-    
-    return href
-
-# Setup
-st.set_page_config(page_title="Time Span Estimator", layout="centered")
-if "page" not in st.session_state:
-    st.session_state.page = "start"
-if "answers" not in st.session_state:
-    st.session_state.answers = []
-if "current_q" not in st.session_state:
-    st.session_state.current_q = 0
-if "language" not in st.session_state:
-    st.session_state.language = "en"
 
-# Language selector (always visible)
-language = st.sidebar.selectbox("🌐 Language / Språk", list(LANGUAGES.keys()), format_func=lambda x: LANGUAGES[x], key="language_selector")
-if language != st.session_state.language:
-    st.session_state.language = language
-    st.rerun()
-
-# Page Routing
-if st.session_state.page == "start":
-    st.title(get_text("title", language))
-    st.markdown(get_text("description", language))
-    
-    purpose = st.selectbox(get_text("purpose_label", language), [
-        get_text("purpose_self", language),
-        get_text("purpose_recruitment", language),
-        get_text("purpose_leadership", language)
-    ])
-    
-    if st.button(get_text("start_button", language)):
-        st.session_state.purpose = purpose
-        st.session_state.page = "questions"
+# Answering a question reruns only this fragment (progress and question);
+# the rest of the script runs again only when the result page is reached
+@st.fragment
+def question_step(language):
+    record = st.session_state.record
+    q_index = record.current_q
+    if record.page != "questions" or q_index >= len(QUESTION_BANK):
+        record.page = "result"
         st.rerun()
-
-elif st.session_state.page == "questions":
-    q_index = st.session_state.current_q
-    if q_index < len(QUESTIONS_MULTILINGUAL):
-        q = QUESTIONS_MULTILINGUAL[q_index]
-        
+    run_profiler = step_profiler()
+    with run_profiler.span("question step"):
+        q = QUESTION_BANK[q_index]
+        # Questions answered so far (adaptive mode asks them out of order)
+        step = record.answered_count()
+    
         # Progress bar and indicators
-        progress = (q_index + 1) / len(QUESTIONS_MULTILINGUAL)
+        progress = (step + 1) / len(QUESTION_BANK)
         st.progress(progress)
-        
+    
         # Question completion indicators
-        cols = st.columns(len(QUESTIONS_MULTILINGUAL))
+        cols = st.columns(len(QUESTION_BANK))
         for i, col in enumerate(cols):
-            if i < q_index:
+            if i < step:
                 col.markdown(get_text("completed", language))  # Completed
-            elif i == q_index:
+            elif i == step:
                 col.markdown(get_text("current", language))  # Current
             else:
                 col.markdown(get_text("not_started", language))  # Not started
-        
+    
         # Enhanced question header with progress
         col1, col2, col3 = st.columns([1, 3, 1])
         with col2:
             st.markdown(f"""
             <div style="text-align: center; margin-bottom: 20px;">
-                <h3>{get_text('question_progress', language).format(q_index + 1, len(QUESTIONS_MULTILINGUAL))}</h3>
+                <h3>{get_text('question_progress', language).format(step + 1, len(QUESTION_BANK))}</h3>
                 <p style="color: #666; font-size: 14px;">{get_text('percent_complete', language).format(int(progress * 100))}</p>
             </div>
             """, unsafe_allow_html=True)
-        
+    
         # Question content
-        st.markdown(f"### {q['text'][language]}")
-        answer = st.radio("Select your answer:", q["options"][language], key=f"q_{q_index}")
-        
+        st.markdown(f"### {q.text[language]}")
+        st.radio("Select your answer:", range(len(q)), format_func=lambda i: q.option_text(i, language), key=f"q_{q_index}")
+    
         # Simple navigation button
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
-            if st.button(get_text("next_question", language), type="primary"):
-                selected_index = q["options"][language].index(answer)
-                st.session_state.answers.append(q["levels"][selected_index])
-                st.session_state.current_q += 1
-                st.rerun()
-    else:
-        st.session_state.page = "result"
+            st.button(get_text("next_question", language), type="primary", on_click=answer_question)
+    if run_profiler is not profiler:
+        run_profiler.finish(container=st, page="questions", fragment=True, language=language)
+
+
+# Page Routing
+page = "team" if st.query_params.get("view") == "team" else record.page
+profiler.enter(f"page: {page}")
+if page == "team":
+    from cohort_dashboard import render_cohort_dashboard
+    render_cohort_dashboard(language)
+
+elif page == "start":
+    st.title(get_text("title", language))
+    st.markdown(get_text("description", language))
+    
+    purposes = language_bundle(language).purposes
+    selected_purpose = st.selectbox(get_text("purpose_label", language), range(len(purposes)),
+                                    format_func=purposes.__getitem__)
+    
+    if st.button(get_text("start_button", language)):
+        first_question = 0
+        if record.adaptive:
+            from adaptive import default_plan
+
+            first_question = default_plan().next_question(record.selections)
+        record.start(selected_purpose, first_question)
         st.rerun()
 
-elif st.session_state.page == "result":
-    avg_level = calculate_average_level(st.session_state.answers)
-    summary, description = interpret_level(avg_level, st.session_state.purpose, language)
+elif page == "questions":
+    question_step(language)
+
+elif page == "result":
+    # Chart backends are only needed here; importing them lazily keeps
+    # cold starts and the question flow free of Plotly's import cost
+    with profiler.span("import charts"):
+        from charts import gauge_figure, distribution_figure, category_figure
+
+    if "result_cache" not in st.session_state:
+        # Answers are fixed once on this page, so entries only vary by language;
+        # keep just the current one, switching back recomputes in about a millisecond
+        st.session_state.result_cache = ResultCache(maxsize=1)
+    purpose = record.purpose(language)
+    # Stratum names, time horizons, tips etc., translated once per process
+    bundle = language_bundle(language)
+    with profiler.span("compute result"):
+        result = st.session_state.result_cache.get_or_compute(record.selections, language, purpose)
+    answers = result["answers"]
+    avg_level = result["avg_level"]
+    summary, description = result["summary"], result["description"]
+
+    # Persist the completed assessment once; the store writes in the background
+    with profiler.span("record result"):
+        if not record.recorded:
+            store = get_store()
+            # Adaptive results are stored too, with their unasked questions left empty
+            if store is not None:
+                store.record(
+                    record.selections,
+                    avg_level,
+                    language,
+                    purpose_id=record.purpose_id,
+                    purpose=purpose,
+                    completed_at=result["completed_at"],
+                    cohort=record.cohort,
+                )
+            record.recorded = True
 
     # Main result header
     st.success(f"**{get_text('result_title', language).format(avg_level)}**")
@@ -292,361 +227,222 @@ elif st.session_state.page == "result":
     st.write(description)
     
     # Create tabs for different views - NOW WITH 5 TABS INCLUDING EXPORT
+    # Only the open tab's content runs; switching tabs reruns the script
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         get_text("overview_tab", language), 
         get_text("analysis_tab", language), 
         get_text("insights_tab", language), 
         get_text("summary_tab", language), 
         get_text("export_tab", language)
-    ])
-    
-    with tab1:
-        st.markdown(f"### {get_text('time_span_profile', language)}")
-        
-        # Gauge chart showing stratum level
-        try:
-            fig_gauge = go.Figure(go.Indicator(
-                mode = "gauge+number+delta",
-                value = avg_level,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': get_text("stratum_level", language)},
-                delta = {'reference': 4},
-                gauge = {
-                    'axis': {'range': [None, 7]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 1], 'color': "lightgray"},
-                        {'range': [1, 2], 'color': "lightblue"},
-                        {'range': [2, 3], 'color': "lightgreen"},
-                        {'range': [3, 4], 'color': "yellow"},
-                        {'range': [4, 5], 'color': "orange"},
-                        {'range': [5, 6], 'color': "red"},
-                        {'range': [6, 7], 'color': "darkred"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 7
-                    }
-                }
-            ))
-            fig_gauge.update_layout(height=400)
-            st.plotly_chart(fig_gauge, use_container_width=True)
-        except Exception as e:
-            st.error(f"Chart could not be displayed: {e}")
-            st.info("Your stratum level: " + str(avg_level))
-        
-        # Stratum level comparison
-        stratum_info = {
-            1: get_text("stratum_1", language),
-            2: get_text("stratum_2", language), 
-            3: get_text("stratum_3", language),
-            4: get_text("stratum_4", language),
-            5: get_text("stratum_5", language),
-            6: get_text("stratum_6", language),
-            7: get_text("stratum_7", language)
-        }
-        
-        st.markdown(f"### {get_text('stratum_level_comparison', language)}")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown(f"**{get_text('your_level', language)}**")
-            st.markdown(f"**Stratum {avg_level}** - {stratum_info[avg_level]}")
-        with col2:
-            st.markdown(f"**{get_text('typical_range', language)}**")
-            st.markdown(get_text("most_people_range", language))
+    ], key="result_tab", on_change="rerun")
     
-    with tab2:
-        st.markdown(f"### {get_text('answer_distribution', language)}")
-        
-        # Create histogram of answers
-        answer_counts = {}
-        for level in st.session_state.answers:
-            answer_counts[level] = answer_counts.get(level, 0) + 1
-        
-        # Bar chart of answer distribution
-        levels = list(answer_counts.keys())
-        counts = list(answer_counts.values())
-        
-        try:
-            fig_bar = px.bar(
-                x=levels, 
-                y=counts,
-                labels={'x': get_text('stratum_level_label', language), 'y': get_text('number_of_answers', language)},
-                title=get_text("distribution_title", language),
-                color=levels,
-                color_continuous_scale="viridis"
-            )
-            fig_bar.update_layout(height=400)
-            st.plotly_chart(fig_bar, use_container_width=True)
-        except Exception as e:
-            st.error(f"Bar chart could not be displayed: {e}")
-            st.write("Answer distribution:", answer_counts)
-        
-        # Answer pattern analysis
-        st.markdown(f"### {get_text('answer_pattern_analysis', language)}")
-        
-        # Calculate statistics
-        min_level = min(st.session_state.answers)
-        max_level = max(st.session_state.answers)
-        level_range = max_level - min_level
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(get_text("lowest_level", language), f"Stratum {min_level}")
-        with col2:
-            st.metric(get_text("highest_level", language), f"Stratum {max_level}")
-        with col3:
-            st.metric(get_text("range", language), f"{level_range} {get_text('levels', language)}")
-        
-        # Consistency analysis
-        if level_range <= 2:
-            consistency = get_text("high_consistency", language)
-        elif level_range <= 4:
-            consistency = get_text("moderate_consistency", language)
-        else:
-            consistency = get_text("high_variability", language)
+    with tab1, profiler.span("tab: overview"):
+        if tab1.open:
+            st.markdown(f"### {get_text('time_span_profile', language)}")
         
-        st.info(f"**{get_text('consistency_analysis', language)}** {consistency}")
+            # Gauge chart showing stratum level
+            try:
+                fig_gauge = result_panel(result, "gauge", lambda: gauge_figure(avg_level, language))
+                st.plotly_chart(fig_gauge, width="stretch")
+            except Exception as e:
+                st.error(f"Chart could not be displayed: {e}")
+                st.info("Your stratum level: " + str(avg_level))
+        
+            # Stratum level comparison
+            st.markdown(f"### {get_text('stratum_level_comparison', language)}")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"**{get_text('your_level', language)}**")
+                st.markdown(f"**Stratum {avg_level}** - {bundle.strata[avg_level]}")
+            with col2:
+                st.markdown(f"**{get_text('typical_range', language)}**")
+                st.markdown(get_text("most_people_range", language))
     
-    with tab3:
-        st.markdown(f"### {get_text('detailed_insights', language)}")
-        
-        # Category analysis
-        category_averages = analyze_by_category(st.session_state.answers, language)
-        strengths, weaknesses = get_strength_weakness_analysis(category_averages)
-        
-        # Category performance chart
-        st.markdown(f"#### {get_text('performance_by_category', language)}")
-        categories = list(category_averages.keys())
-        scores = list(category_averages.values())
-        
-        try:
-            fig_category = px.bar(
-                x=categories,
-                y=scores,
-                labels={'x': get_text('category_label', language), 'y': get_text('average_stratum_level', language)},
-                title=get_text("category_performance_title", language),
-                color=scores,
-                color_continuous_scale="RdYlGn"
-            )
-            fig_category.update_layout(height=400, xaxis_tickangle=-45)
-            st.plotly_chart(fig_category, use_container_width=True)
-        except Exception as e:
-            st.error(f"Category chart could not be displayed: {e}")
-        
-        # Strengths and weaknesses
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown(f"#### {get_text('your_strengths', language)}")
-            for category, score in strengths:
-                st.markdown(f"**{category}** (Stratum {score:.1f})")
-                if score >= 5:
-                    st.markdown(get_text("exceptional_strategic", language))
-                elif score >= 4:
-                    st.markdown(get_text("strong_operational", language))
-                else:
-                    st.markdown(get_text("solid_foundation", language))
+    with tab2, profiler.span("tab: analysis"):
+        if tab2.open:
+            st.markdown(f"### {get_text('answer_distribution', language)}")
         
-        with col2:
-            st.markdown(f"#### {get_text('development_areas', language)}")
-            for category, score in weaknesses:
-                st.markdown(f"**{category}** (Stratum {score:.1f})")
-                if score <= 2:
-                    st.markdown(get_text("focus_expanding", language))
-                elif score <= 3:
-                    st.markdown(get_text("develop_strategic", language))
-                else:
-                    st.markdown(get_text("enhance_approach", language))
-        
-        # Development roadmap
-        st.markdown(f"#### {get_text('development_roadmap', language)}")
-        overall_avg = sum(st.session_state.answers) / len(st.session_state.answers)
-        
-        if overall_avg <= 3:
-            st.markdown(f"""
-            {get_text('next_steps_growth', language)}
-            {get_text('expand_planning', language)}
-            {get_text('strategic_projects', language)}
-            {get_text('mentorship_guidance', language)}
-            """)
-        elif overall_avg <= 5:
-            st.markdown(f"""
-            {get_text('next_steps_growth', language)}
-            {get_text('systems_thinking', language)}
-            {get_text('vision_development', language)}
-            {get_text('cross_functional', language)}
-            """)
-        else:
-            st.markdown(f"""
-            {get_text('next_steps_growth', language)}
-            {get_text('mentorship_share', language)}
-            {get_text('organizational_influence', language)}
-            {get_text('industry_leadership', language)}
-            """)
-        
-        # Original insights
-        st.markdown("---")
-        st.markdown(f"### {get_text('original_insights', language)}")
-        
-        # Time horizon visualization
-        time_horizons = {
-            1: get_text("time_horizon_1", language),
-            2: get_text("time_horizon_2", language), 
-            3: get_text("time_horizon_3", language),
-            4: get_text("time_horizon_4", language),
-            5: get_text("time_horizon_5", language),
-            6: get_text("time_horizon_6", language),
-            7: get_text("time_horizon_7", language)
-        }
-        
-        st.markdown(f"**{get_text('natural_time_horizon', language)}** {time_horizons[avg_level]}")
-        
-        # Development suggestions based on level
-        development_tips = {
-            1: get_text("dev_tip_1", language),
-            2: get_text("dev_tip_2", language),
-            3: get_text("dev_tip_3", language),
-            4: get_text("dev_tip_4", language),
-            5: get_text("dev_tip_5", language),
-            6: get_text("dev_tip_6", language),
-            7: get_text("dev_tip_7", language)
-        }
-        
-        st.markdown(f"### {get_text('development_suggestions', language)}")
-        st.write(development_tips[avg_level])
-        
-        # Purpose-specific insights
-        if st.session_state.purpose == get_text("purpose_leadership", language):
-            st.markdown(f"### {get_text('leadership_development_focus', language)}")
-            if avg_level <= 3:
-                st.write(get_text("focus_strategic", language))
-            elif avg_level <= 5:
-                st.write(get_text("enhance_systemic", language))
-            else:
-                st.write(get_text("leverage_visionary", language))
-        
-        elif st.session_state.purpose == get_text("purpose_recruitment", language):
-            st.markdown(f"### {get_text('role_alignment', language)}")
-            role_suggestions = {
-                1: get_text("individual_contributor", language),
-                2: get_text("team_coordination", language), 
-                3: get_text("project_management", language),
-                4: get_text("functional_leadership", language),
-                5: get_text("strategic_leadership_roles", language),
-                6: get_text("executive_roles", language),
-                7: get_text("c_suite_roles", language)
-            }
-            st.write(f"**{get_text('suggested_role_types', language)}** {role_suggestions[avg_level]}")
+            # Create histogram of answers
+            answer_counts = {}
+            for level in answers:
+                answer_counts[level] = answer_counts.get(level, 0) + 1
+        
+            # Bar chart of answer distribution
+            levels = list(answer_counts.keys())
+            counts = list(answer_counts.values())
+        
+            try:
+                fig_bar = result_panel(result, "distribution", lambda: distribution_figure(tuple(levels), tuple(counts), language))
+                st.plotly_chart(fig_bar, width="stretch")
+            except Exception as e:
+                st.error(f"Bar chart could not be displayed: {e}")
+                st.write("Answer distribution:", answer_counts)
+        
+            # Answer pattern analysis
+            st.markdown(f"### {get_text('answer_pattern_analysis', language)}")
+        
+            # Calculate statistics
+            min_level = min(answers)
+            max_level = max(answers)
+            level_range = max_level - min_level
+        
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(get_text("lowest_level", language), f"Stratum {min_level}")
+            with col2:
+                st.metric(get_text("highest_level", language), f"Stratum {max_level}")
+            with col3:
+                st.metric(get_text("range", language), f"{level_range} {get_text('levels', language)}")
+        
+            # Consistency analysis
+            consistency = get_text(consistency_key(level_range), language)
+            st.info(f"**{get_text('consistency_analysis', language)}** {consistency}")
     
-    with tab4:
-        st.markdown(f"### {get_text('assessment_summary', language)}")
-        
-        # Summary metrics
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric(get_text("final_stratum_level", language), f"Level {avg_level}")
-            st.metric(get_text("questions_completed", language), f"{len(st.session_state.answers)}/12")
-        with col2:
-            st.metric(get_text("assessment_purpose", language), st.session_state.purpose)
-            st.metric(get_text("average_score", language), f"{sum(st.session_state.answers)/len(st.session_state.answers):.1f}")
-        
-        # Answer breakdown
-        st.markdown(f"### {get_text('answers_by_question', language)}")
-        for i, (question, answer_level) in enumerate(zip(QUESTIONS_MULTILINGUAL, st.session_state.answers)):
-            with st.expander(f"Question {i+1}: {question['text'][language][:50]}..."):
-                st.write(f"**{get_text('your_answer_level', language)}** Stratum {answer_level}")
-                # Find which option corresponds to this answer level
-                option_index = question['levels'].index(answer_level)
-                st.write(f"**{get_text('selected_option', language)}** {question['options'][language][option_index]}")
-        
-        st.markdown("---")
-        st.markdown(f"*{get_text('assessment_completed', language)} {st.session_state.purpose}*")
-
-    # NEW EXPORT TAB
-    with tab5:
-        st.markdown(f"### {get_text('export_title', language)}")
-        st.markdown(get_text("export_description", language))
+    with tab3, profiler.span("tab: insights"):
+        if tab3.open:
+            st.markdown(f"### {get_text('detailed_insights', language)}")
         
-        # Generate export data
-        csv_data = generate_csv_data(st.session_state.answers, avg_level, st.session_state.purpose, language)
-        json_data = generate_json_data(st.session_state.answers, avg_level, st.session_state.purpose, language)
+            # Category analysis
+            category_averages = result["category_averages"]
+            strengths, weaknesses = result["strengths"], result["weaknesses"]
         
-        # Export options
-        col1, col2 = st.columns(2)
+            # Category performance chart
+            st.markdown(f"#### {get_text('performance_by_category', language)}")
+            categories = list(category_averages.keys())
+            scores = list(category_averages.values())
         
-        with col1:
-            st.markdown(f"#### {get_text('csv_export', language)}")
-            st.markdown(f"**{get_text('csv_description', language)}**")
-            st.markdown(get_text("includes_all", language))
+            try:
+                fig_category = result_panel(result, "category", lambda: category_figure(tuple(categories), tuple(scores), language))
+                st.plotly_chart(fig_category, width="stretch")
+            except Exception as e:
+                st.error(f"Category chart could not be displayed: {e}")
+        
+            # Strengths and weaknesses
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown(f"#### {get_text('your_strengths', language)}")
+                for category, score in strengths:
+                    st.markdown(f"**{category}** (Stratum {score:.1f})")
+                    st.markdown(get_text(strength_note_key(score), language))
+        
+            with col2:
+                st.markdown(f"#### {get_text('development_areas', language)}")
+                for category, score in weaknesses:
+                    st.markdown(f"**{category}** (Stratum {score:.1f})")
+                    st.markdown(get_text(development_note_key(score), language))
+        
+            # Development roadmap
+            st.markdown(f"#### {get_text('development_roadmap', language)}")
+            overall_avg = sum(answers) / len(answers)
+            st.markdown("\n".join(get_text(key, language) for key in roadmap_keys(overall_avg)))
+        
+            # Original insights
+            st.markdown("---")
+            st.markdown(f"### {get_text('original_insights', language)}")
+        
+            # Time horizon visualization
+            st.markdown(f"**{get_text('natural_time_horizon', language)}** {bundle.time_horizons[avg_level]}")
+        
+            # Development suggestions based on level
+            st.markdown(f"### {get_text('development_suggestions', language)}")
+            st.write(bundle.development_tips[avg_level])
+        
+            # Purpose-specific insights
+            purpose_key = PURPOSE_KEYS[record.purpose_id]
+            if purpose_key == "purpose_leadership":
+                st.markdown(f"### {get_text('leadership_development_focus', language)}")
+                st.write(get_text(leadership_focus_key(avg_level), language))
+        
+            elif purpose_key == "purpose_recruitment":
+                st.markdown(f"### {get_text('role_alignment', language)}")
+                st.write(f"**{get_text('suggested_role_types', language)}** {bundle.role_suggestions[avg_level]}")
+    
+    with tab4, profiler.span("tab: summary"):
+        if tab4.open:
+            st.markdown(f"### {get_text('assessment_summary', language)}")
+        
+            # Summary metrics
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(get_text("final_stratum_level", language), f"Level {avg_level}")
+                st.metric(get_text("questions_completed", language), f"{len(answers)}/12")
+            with col2:
+                st.metric(get_text("assessment_purpose", language), purpose)
+                st.metric(get_text("average_score", language), f"{sum(answers)/len(answers):.1f}")
+        
+            # Answer breakdown
+            st.markdown(f"### {get_text('answers_by_question', language)}")
+            for i, (question, option_index) in enumerate(zip(QUESTION_BANK, record.selections)):
+                if option_index is None:
+                    continue
+                with st.expander(f"Question {i+1}: {question.text[language][:50]}..."):
+                    st.write(f"**{get_text('your_answer_level', language)}** Stratum {question.level_for(option_index)}")
+                    st.write(f"**{get_text('selected_option', language)}** {question.option_text(option_index, language)}")
+        
+            st.markdown("---")
+            st.markdown(f"*{get_text('assessment_completed', language)} {purpose}*")
+
+    # NEW EXPORT TAB
+    with tab5, profiler.span("tab: export"):
+        if tab5.open:
+            st.markdown(f"### {get_text('export_title', language)}")
+            st.markdown(get_text("export_description", language))
+        
+            # Export documents are built only while this tab is open, not cached per session
+            completed_at = result["completed_at"]
+            csv_data = generate_csv_data(record.selections, avg_level, purpose, language, completed_at)
+            json_data = generate_json_data(record.selections, avg_level, purpose, language, completed_at)
+        
+            # Export options
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown(f"#### {get_text('csv_export', language)}")
+                st.markdown(f"**{get_text('csv_description', language)}**")
+                st.markdown(get_text("includes_all", language))
             
-            csv_filename = f"time_span_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            csv_link = create_download_link(csv_data, csv_filename, "csv")
-            st.markdown(csv_link, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f"#### {get_text('json_export', language)}")
-            st.markdown(f"**{get_text('json_description', language)}**")
-            st.markdown(get_text("includes_structured", language))
+                csv_filename = f"time_span_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                st.download_button(
+                    "Download CSV File",
+                    data=lambda: export_bytes(csv_data, "csv"),
+                    file_name=csv_filename,
+                    mime=MIME_TYPES["csv"],
+                    on_click="ignore",
+                )
+        
+            with col2:
+                st.markdown(f"#### {get_text('json_export', language)}")
+                st.markdown(f"**{get_text('json_description', language)}**")
+                st.markdown(get_text("includes_structured", language))
             
-            json_filename = f"time_span_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            json_link = create_download_link(json_data, json_filename, "json")
-            st.markdown(json_link, unsafe_allow_html=True)
-        
-        # Summary report
-        st.markdown("---")
-        st.markdown(f"#### {get_text('summary_report', language)}")
-        
-        time_horizons = {
-            1: get_text("time_horizon_1", language),
-            2: get_text("time_horizon_2", language), 
-            3: get_text("time_horizon_3", language),
-            4: get_text("time_horizon_4", language),
-            5: get_text("time_horizon_5", language),
-            6: get_text("time_horizon_6", language),
-            7: get_text("time_horizon_7", language)
-        }
-        
-        development_tips = {
-            1: get_text("dev_tip_1", language),
-            2: get_text("dev_tip_2", language),
-            3: get_text("dev_tip_3", language),
-            4: get_text("dev_tip_4", language),
-            5: get_text("dev_tip_5", language),
-            6: get_text("dev_tip_6", language),
-            7: get_text("dev_tip_7", language)
-        }
-        
-        summary_report = f"""
-# {get_text('report_title', language)}
-
-**{get_text('assessment_date', language)}** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-**{get_text('assessment_purpose', language)}** {st.session_state.purpose}
-**{get_text('final_stratum_level', language)}** {avg_level}
-
-## {get_text('key_results', language)}
-- **{get_text('your_time_horizon', language)}** {time_horizons[avg_level]}
-- **{get_text('consistency_range', language)}** {max(st.session_state.answers) - min(st.session_state.answers)} {get_text('levels', language)}
-- **{get_text('questions_completed_report', language)}** {len(st.session_state.answers)}/12
-
-## {get_text('summary_section', language)}
-{summary}
-
-{description}
-
-## {get_text('development_focus', language)}
-{development_tips[avg_level]}
-"""
-        
-        st.text_area(get_text("copy_summary", language), summary_report, height=300)
-        
-        # Copy to clipboard button
-        if st.button(get_text("copy_button", language)):
-            st.success(get_text("summary_copied", language))
+                json_filename = f"time_span_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                st.download_button(
+                    "Download JSON File",
+                    data=lambda: export_bytes(json_data, "json"),
+                    file_name=json_filename,
+                    mime=MIME_TYPES["json"],
+                    on_click="ignore",
+                )
+        
+            # Summary report
+            st.markdown("---")
+            st.markdown(f"#### {get_text('summary_report', language)}")
+        
+            summary_report = generate_summary_report(answers, avg_level, summary, description, purpose, language)
+        
+            st.text_area(get_text("copy_summary", language), summary_report, height=300)
+        
+            # Copy to clipboard button
+            if st.button(get_text("copy_button", language)):
+                st.success(get_text("summary_copied", language))
 
     # Restart button
     if st.button(get_text("restart_button", language)):
-        for key in ["page", "answers", "current_q"]:
+        record.restart()
+        for key in ["result_cache", "result_tab"]:
             del st.session_state[key]
         st.rerun()
+
+profiler.exit()
+profiler.finish(page=page, language=language)
@@ -0,0 +1,130 @@
+# preflight.py - One-time dependency check for the Streamlit app
+#
+# Streamlit re-executes main.py on every interaction, so the requirements
+# check must be close to free after the first run:
+# - within a process it runs once (this module is imported once, main.py is
+#   re-executed);
+# - across processes a stamp file records that requirements.txt, identified by
+#   its SHA-256, was already satisfied by this Python interpreter.
+#
+# Set TIME_SPAN_PRODUCTION=1 to never pip-install at runtime: missing packages
+# are reported and the check fails immediately.
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from config.flags import flag_enabled
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REQUIREMENTS_PATH = os.path.join(BASE_DIR, "requirements.txt")
+STAMP_PATH = os.environ.get("TIME_SPAN_PREFLIGHT_STAMP", os.path.join(BASE_DIR, ".preflight_stamp.json"))
+
+_preflight_done = False
+
+
+def production_mode():
+    """True when runtime installs are disabled"""
+    return flag_enabled("TIME_SPAN_PRODUCTION")
+
+
+def requirements_hash():
+    """SHA-256 of requirements.txt ("" if the file is missing)"""
+    try:
+        with open(REQUIREMENTS_PATH, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def read_requirements():
+    """Read requirements from requirements.txt if it exists"""
+    requirements = []
+    if os.path.exists(REQUIREMENTS_PATH):
+        with open(REQUIREMENTS_PATH, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    # Extract package name (remove version specifiers)
+                    package = line.split('>=')[0].split('<=')[0].split('==')[0].split('!=')[0].split('~=')[0]
+                    requirements.append(package.strip())
+    return requirements
+
+
+def _stamp_matches(digest):
+    try:
+        with open(STAMP_PATH, "r") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return stamp.get("requirements_sha256") == digest and stamp.get("python") == sys.executable
+
+
+def _write_stamp(digest):
+    stamp = {
+        "requirements_sha256": digest,
+        "python": sys.executable,
+        "checked_at": datetime.now().isoformat(),
+    }
+    tmp_path = f"{STAMP_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(stamp, f)
+        os.replace(tmp_path, STAMP_PATH)
+    except OSError:
+        # A read-only install still benefits from the in-process memo
+        pass
+
+
+def check_and_install_requirements():
+    """Check and install required packages"""
+    # Get requirements from file or use default
+    required_packages = read_requirements()
+    if not required_packages:
+        required_packages = ['streamlit']  # fallback
+
+    missing_packages = []
+
+    for package in required_packages:
+        if importlib.util.find_spec(package) is None:
+            missing_packages.append(package)
+
+    if missing_packages and production_mode():
+        print(f"Missing required packages: {', '.join(missing_packages)}", file=sys.stderr)
+        print("Runtime installs are disabled (TIME_SPAN_PRODUCTION); install them in the image.", file=sys.stderr)
+        return False
+
+    if missing_packages:
+        print("Installing missing packages...")
+        for package in missing_packages:
+            try:
+                print(f"Installing {package}...")
+                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+                print(f"Successfully installed {package}")
+            except subprocess.CalledProcessError:
+                print(f"Failed to install {package}. Please install it manually: pip install {package}")
+                return False
+        print("All packages installed successfully!")
+    return True
+
+
+def ensure_requirements():
+    """Run the requirements check once per process and requirements.txt version"""
+    global _preflight_done
+    if _preflight_done:
+        return True
+    digest = requirements_hash()
+    if not _stamp_matches(digest):
+        if not check_and_install_requirements():
+            return False
+        _write_stamp(digest)
+    _preflight_done = True
+    return True
+
+
+if __name__ == "__main__":
+    # Run at image build time so the first request finds a fresh stamp
+    sys.exit(0 if ensure_requirements() else 1)
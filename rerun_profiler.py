@@ -0,0 +1,156 @@
+# rerun_profiler.py - Optional timed spans for each script run of main.py
+#
+# Enable with TIME_SPAN_PROFILE=1 or by opening the app with ?profile=1.
+# Each run then records how long every phase took (preflight, setup, each
+# page and tab), shows the spans in a sidebar panel and logs them as one JSON
+# line on the "time_span.profile" logger (stderr by default).
+#
+# Fragment reruns (answering a question) do not run the script, so they get a
+# profiler of their own that also covers the Next-button callback, and show
+# their panel inside the fragment.
+#
+# When disabled, start_run() returns NULL_PROFILER, whose span() hands back a
+# shared no-op context manager, so instrumented code pays one method call.
+import json
+import logging
+import time
+from contextlib import nullcontext
+
+from config.flags import flag_enabled
+
+ENV_FLAG = "TIME_SPAN_PROFILE"
+QUERY_FLAG = "profile"
+
+logger = logging.getLogger("time_span.profile")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_NULL_SPAN = nullcontext()
+
+
+def profiling_enabled(query_params=None):
+    """True when the env var or the ?profile= query flag asks for profiling"""
+    return flag_enabled(ENV_FLAG, query_params, QUERY_FLAG)
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start", "depth")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.profiler._depth
+        self.profiler._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.profiler._depth -= 1
+        self.profiler.add(self.name, self.start, end, self.depth)
+        return False
+
+
+class RerunProfiler:
+    """Timed spans of one script run"""
+    enabled = True
+
+    def __init__(self, started_at=None):
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.finished = False
+        self.spans = []
+        self._depth = 0
+        self._open = []
+
+    def span(self, name):
+        """Context manager timing a named phase; spans may nest"""
+        return _Span(self, name)
+
+    def enter(self, name):
+        """Open a span that is closed by the next exit() (for code not in one block)"""
+        span = _Span(self, name)
+        span.__enter__()
+        self._open.append(span)
+
+    def exit(self):
+        self._open.pop().__exit__(None, None, None)
+
+    def add(self, name, start, end, depth=0):
+        """Record a span measured elsewhere (perf_counter start/end)"""
+        self.spans.append((name, start, end, depth))
+
+    def report(self, **context):
+        """Spans in start order with offsets and durations in ms, plus context fields"""
+        spans = sorted(self.spans, key=lambda span: span[1])
+        return {
+            "event": "rerun_profile",
+            **context,
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 3),
+            "spans": [
+                {
+                    "name": name,
+                    "depth": depth,
+                    "offset_ms": round((start - self.started_at) * 1000, 3),
+                    "ms": round((end - start) * 1000, 3),
+                }
+                for name, start, end, depth in spans
+            ],
+        }
+
+    def finish(self, container=None, **context):
+        """Log the run as JSON and show it in container (default: the sidebar)"""
+        self.finished = True
+        report = self.report(**context)
+        logger.info(json.dumps(report, ensure_ascii=False))
+        render_sidebar_panel(report, container)
+        return report
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every method is a no-op"""
+    enabled = False
+    finished = False
+
+    def span(self, name):
+        return _NULL_SPAN
+
+    def enter(self, name):
+        pass
+
+    def exit(self):
+        pass
+
+    def add(self, name, start, end, depth=0):
+        pass
+
+    def finish(self, container=None, **context):
+        return None
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def start_run(started_at, query_params=None):
+    """Profiler for this script run: a RerunProfiler when enabled, else NULL_PROFILER"""
+    if profiling_enabled(query_params):
+        return RerunProfiler(started_at)
+    return NULL_PROFILER
+
+
+def render_sidebar_panel(report, container=None):
+    """Debug panel listing this run's spans (in the sidebar unless container is given)"""
+    import streamlit as st
+
+    with (container or st.sidebar).expander(f"⏱ Rerun profile: {report['total_ms']:.1f} ms", expanded=False):
+        rows = ["| Phase | ms | at ms |", "|---|---:|---:|"]
+        for span in report["spans"]:
+            indent = "&nbsp;&nbsp;" * 2 * span["depth"]
+            rows.append(f"| {indent}{span['name']} | {span['ms']:.2f} | {span['offset_ms']:.1f} |")
+        st.markdown("\n".join(rows), unsafe_allow_html=True)
+        st.caption("Spans cover script execution; delta delivery to the browser happens after the run.")
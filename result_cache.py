@@ -0,0 +1,92 @@
+# result_cache.py - Bounded LRU cache of computed result pages
+#
+# A result depends only on the selected options, the language and the
+# purpose, so reruns of the result page (tab switches, widget clicks) can
+# reuse everything derived from them. Export documents and the summary report
+# are not cached: the export tab rebuilds them from the entry when it is open.
+# A cache belongs to one session and fixes the completion time its exports
+# show.
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from scoring import (
+    calculate_average_level,
+    interpret_level,
+    analyze_by_category,
+    get_strength_weakness_analysis,
+    answer_levels,
+)
+
+
+def compute_result(selections, language, purpose, completed_at=None):
+    """Compute everything the result page shows for one set of answers"""
+    levels = answer_levels(selections)
+    # Adaptive assessments leave unasked questions as None
+    answers = [level for level in levels if level is not None]
+    avg_level = calculate_average_level(answers)
+    summary, description = interpret_level(avg_level, purpose, language)
+    category_averages = analyze_by_category(levels, language)
+    strengths, weaknesses = get_strength_weakness_analysis(category_averages)
+    return {
+        "answers": answers,
+        "avg_level": avg_level,
+        "summary": summary,
+        "description": description,
+        "category_averages": category_averages,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "completed_at": completed_at or datetime.now(),
+    }
+
+
+def result_panel(result, name, build):
+    """Build part of a result page (e.g. a figure) on first use and keep it with the cached result"""
+    panels = result.setdefault("panels", {})
+    if name not in panels:
+        panels[name] = build()
+    return panels[name]
+
+
+class ResultCache:
+    """LRU cache of compute_result() keyed by (selections, language, purpose)"""
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.completed_at = datetime.now()
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, selections, language, purpose):
+        """Return the cached result, computing and storing it on a miss"""
+        key = (tuple(selections), language, purpose)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = compute_result(key[0], language, purpose, self.completed_at)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
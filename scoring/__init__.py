@@ -0,0 +1,38 @@
+# scoring - Question bank, scoring, category analysis and exports
+#
+# Everything needed to score an assessment without the UI: the Streamlit app,
+# the batch tools and the scoring API all use this package, and importing it
+# loads no Streamlit, Plotly, pandas or numpy. The vectorized cohort scorer
+# (scoring.batch) and the bank file loader (scoring.loader) are imported
+# explicitly by the code that needs them.
+#
+#   questions  QUESTION_BANK and option index <-> level mapping
+#   content    per-language static texts (strata, categories, purposes, ...)
+#   core       stratum level, interpretation, category analysis, insight keys
+#   reports    summary report templates compiled per language and format
+#   exports    CSV/JSON export documents and their encoded files
+from scoring.questions import QUESTION_BANK, CompiledQuestion, answer_levels, selections_for_levels
+from scoring.content import CATEGORY_KEYS, PURPOSE_KEYS, LanguageBundle, language_bundle
+from scoring.core import (
+    purpose_id,
+    calculate_average_level,
+    interpret_level,
+    categorize_questions,
+    analyze_by_category,
+    get_strength_weakness_analysis,
+    consistency_key,
+    strength_note_key,
+    development_note_key,
+    roadmap_keys,
+    leadership_focus_key,
+)
+from scoring.reports import FILE_EXTENSIONS, FORMATS, compile_report
+from scoring.exports import (
+    MIME_TYPES,
+    generate_csv_data,
+    generate_json_data,
+    generate_summary_report,
+    encode_csv,
+    encode_json,
+    export_bytes,
+)
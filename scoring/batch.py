@@ -0,0 +1,105 @@
+# scoring/batch.py - Vectorized scoring for whole cohorts
+import numpy as np
+
+from scoring import categorize_questions
+from scoring.core import CONSISTENCY_BUCKETS
+from scoring.questions import QUESTION_BANK
+
+# Consistency buckets used on the result page, as ids into CONSISTENCY_BUCKETS
+CONSISTENCY_KEYS = {bucket: key for bucket, (_, key) in enumerate(CONSISTENCY_BUCKETS)}
+_CONSISTENCY_LIMITS = np.array([widest for widest, _ in CONSISTENCY_BUCKETS if widest is not None])
+
+
+def category_matrix(language="en"):
+    """Return category names (first-seen order) and a question x category weight matrix"""
+    categories = categorize_questions(language)
+    names = []
+    columns = []
+    for i in range(len(categories)):
+        category = categories[i]
+        if category not in names:
+            names.append(category)
+        columns.append(names.index(category))
+
+    membership = np.zeros((len(categories), len(names)), dtype=np.float64)
+    membership[np.arange(len(categories)), columns] = 1.0
+    # Divide by the number of questions per category so a matmul gives averages
+    return names, membership / membership.sum(axis=0)
+
+
+def levels_from_options(options):
+    """Map an (N x 12) matrix of selected option indices to answer levels"""
+    options = np.asarray(options)
+    width = max(len(question) for question in QUESTION_BANK)
+    table = np.zeros((len(QUESTION_BANK), width), dtype=np.int64)
+    for i, question in enumerate(QUESTION_BANK):
+        table[i, :len(question)] = question.levels
+    return table[np.arange(len(QUESTION_BANK)), options]
+
+
+def average_levels(answers):
+    """Mean answer level per row, matching sum(levels) / len(levels) exactly"""
+    # Integer sum first so the single division rounds like the per-person code
+    answers = np.asarray(answers)
+    return answers.sum(axis=1, dtype=np.int64) / answers.shape[1]
+
+
+def stratum_levels(answers):
+    """Final stratum level per row, like calculate_average_level()"""
+    # np.rint rounds half to even like the built-in round()
+    return np.rint(average_levels(answers)).astype(np.int64)
+
+
+def score_batch(answers, language="en"):
+    """Score an (N x 12) matrix of answer levels in one vectorized pass
+
+    Returns a dict of arrays, one row per respondent, matching the per-person
+    functions in scoring.core: stratum level, category averages, top-3/bottom-3
+    category indices (into "categories") and consistency range.
+    """
+    answers = np.asarray(answers)
+    if answers.ndim != 2:
+        raise ValueError("answers must be a 2-D (respondents x questions) matrix")
+
+    names, weights = category_matrix(language)
+    if answers.shape[1] != weights.shape[0]:
+        raise ValueError(f"expected {weights.shape[0]} answers per row, got {answers.shape[1]}")
+
+    average_scores = average_levels(answers)
+    levels = np.rint(average_scores).astype(np.int64)
+
+    category_averages = answers.astype(np.float64) @ weights
+
+    # Stable descending order keeps ties in category order, like sorted(..., reverse=True)
+    order = np.argsort(-category_averages, axis=1, kind="stable")
+    strengths = order[:, :3]
+    weaknesses = order[:, -3:]
+
+    min_levels = answers.min(axis=1)
+    max_levels = answers.max(axis=1)
+    level_range = max_levels - min_levels
+    # First bucket whose widest range covers the row's range
+    consistency = np.searchsorted(_CONSISTENCY_LIMITS, level_range).astype(np.int8)
+
+    return {
+        "categories": names,
+        "levels": levels,
+        "average_scores": average_scores,
+        "category_averages": category_averages,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "min_levels": min_levels,
+        "max_levels": max_levels,
+        "level_range": level_range,
+        "consistency": consistency,
+    }
+
+
+def row_analysis(scores, row):
+    """Rebuild the per-person (category_averages, strengths, weaknesses) for one row"""
+    names = scores["categories"]
+    averages = scores["category_averages"][row]
+    category_averages = {name: float(averages[i]) for i, name in enumerate(names)}
+    strengths = [(names[i], float(averages[i])) for i in scores["strengths"][row]]
+    weaknesses = [(names[i], float(averages[i])) for i in scores["weaknesses"][row]]
+    return category_averages, strengths, weaknesses
@@ -0,0 +1,83 @@
+# scoring/content.py - Localized static content resolved once per language
+#
+# The result page, scoring and exports look up the same translated texts on
+# every run: stratum names and descriptions, time horizons, development tips,
+# role suggestions, question categories and purpose labels. language_bundle()
+# resolves all of them the first time a language is used; the bundle is
+# read-only and shared by every session in the process.
+from functools import lru_cache
+from types import MappingProxyType
+
+from config.languages import get_text
+
+STRATA = range(1, 8)
+
+# Assessment purposes; the position is the language-neutral purpose id
+PURPOSE_KEYS = ["purpose_self", "purpose_recruitment", "purpose_leadership"]
+
+# Text appended to a stratum description for each purpose
+PURPOSE_ADDITION_KEYS = {
+    "purpose_self": "purpose_add_self",
+    "purpose_recruitment": "purpose_add_recruitment",
+    "purpose_leadership": "purpose_add_leadership",
+}
+
+# Category of each question, as translation keys (language-neutral ids)
+CATEGORY_KEYS = [
+    "category_project_planning",
+    "category_problem_solving",
+    "category_strategic_planning",
+    "category_success_definition",
+    "category_leadership",
+    "category_organizational_change",
+    "category_team_design",
+    "category_mentoring",
+    "category_role_adaptation",
+    "category_service_design",
+    "category_strategy_contribution",
+    "category_success_evaluation"
+]
+
+# Role types suggested for each stratum (recruitment purpose)
+ROLE_SUGGESTION_KEYS = [
+    "individual_contributor",
+    "team_coordination",
+    "project_management",
+    "functional_leadership",
+    "strategic_leadership_roles",
+    "executive_roles",
+    "c_suite_roles"
+]
+
+
+def _by_level(texts):
+    return MappingProxyType(dict(zip(STRATA, texts)))
+
+
+class LanguageBundle:
+    """Read-only localized content for one language; mappings are keyed by stratum 1-7"""
+    __slots__ = ("language", "strata", "stratum_descriptions", "time_horizons", "development_tips",
+                 "role_suggestions", "categories", "purposes", "purpose_ids", "purpose_additions")
+
+    def __init__(self, language):
+        t = lambda key: get_text(key, language)
+        self.language = language
+        self.strata = _by_level(t(f"stratum_{level}") for level in STRATA)
+        self.stratum_descriptions = _by_level(t(f"stratum_desc_{level}") for level in STRATA)
+        self.time_horizons = _by_level(t(f"time_horizon_{level}") for level in STRATA)
+        self.development_tips = _by_level(t(f"dev_tip_{level}") for level in STRATA)
+        self.role_suggestions = _by_level(t(key) for key in ROLE_SUGGESTION_KEYS)
+        # Question index -> category name
+        self.categories = MappingProxyType({i: t(key) for i, key in enumerate(CATEGORY_KEYS)})
+        self.purposes = tuple(t(key) for key in PURPOSE_KEYS)
+        # Localized purpose label -> purpose id / description addition
+        self.purpose_ids = MappingProxyType({label: i for i, label in enumerate(self.purposes)})
+        self.purpose_additions = MappingProxyType({
+            label: t(PURPOSE_ADDITION_KEYS[key]) for label, key in zip(self.purposes, PURPOSE_KEYS)
+        })
+
+
+@lru_cache(maxsize=None)
+def language_bundle(language="en"):
+    """The LanguageBundle for a language, built on first use"""
+    return LanguageBundle(language)
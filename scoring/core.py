@@ -0,0 +1,106 @@
+# scoring/core.py - Stratum scoring, interpretation and category analysis
+from scoring.content import language_bundle
+
+UNDEFINED_STRATUM = ("Undefined", "No clear interpretation.")
+
+# Consistency buckets, in order: (widest range of answer levels, translation key)
+CONSISTENCY_BUCKETS = ((2, "high_consistency"), (4, "moderate_consistency"), (None, "high_variability"))
+
+def purpose_id(purpose, language="en"):
+    """Return the id of a localized purpose label, or None for free text"""
+    return language_bundle(language).purpose_ids.get(purpose)
+
+def calculate_average_level(levels):
+    """Calculate average stratum level (rounded to nearest int), skipping unasked (None) questions"""
+    levels = [level for level in levels if level is not None]
+    if not levels:
+        return 0
+    return round(sum(levels) / len(levels))
+
+def interpret_level(level, purpose, language="en"):
+    """Return short summary and description based on level and use case"""
+    bundle = language_bundle(language)
+    if level in bundle.strata:
+        summary, description = bundle.strata[level], bundle.stratum_descriptions[level]
+    else:
+        summary, description = UNDEFINED_STRATUM
+    # Free-text purposes get no addition
+    return summary, description + bundle.purpose_additions.get(purpose, "")
+
+def categorize_questions(language="en"):
+    """Category name of each question (read-only, shared per language)"""
+    return language_bundle(language).categories
+
+def analyze_by_category(answers, language="en", categories=None):
+    """Analyze answers by category and identify strengths/weaknesses
+
+    Pass categories (question index -> name), e.g. dict(enumerate(CATEGORY_KEYS)),
+    to group by something other than the localized category names.
+    """
+    if categories is None:
+        categories = categorize_questions(language)
+    category_scores = {}
+    
+    for i, answer in enumerate(answers):
+        if answer is None:
+            # Not asked (adaptive mode)
+            continue
+        category = categories[i]
+        if category not in category_scores:
+            category_scores[category] = []
+        category_scores[category].append(answer)
+    
+    # Calculate average for each category
+    category_averages = {}
+    for category, scores in category_scores.items():
+        category_averages[category] = sum(scores) / len(scores)
+    
+    return category_averages
+
+def get_strength_weakness_analysis(category_averages):
+    """Identify strongest and weakest categories"""
+    sorted_categories = sorted(category_averages.items(), key=lambda x: x[1], reverse=True)
+    
+    strengths = sorted_categories[:3]  # Top 3
+    weaknesses = sorted_categories[-3:]  # Bottom 3
+    
+    return strengths, weaknesses
+
+# Result-page insights, as translation keys
+def consistency_key(level_range):
+    """How consistent answers spanning level_range strata are"""
+    for widest, key in CONSISTENCY_BUCKETS:
+        if widest is None or level_range <= widest:
+            return key
+
+def strength_note_key(score):
+    """Comment on a strong category's average level"""
+    if score >= 5:
+        return "exceptional_strategic"
+    elif score >= 4:
+        return "strong_operational"
+    return "solid_foundation"
+
+def development_note_key(score):
+    """Comment on a weak category's average level"""
+    if score <= 2:
+        return "focus_expanding"
+    elif score <= 3:
+        return "develop_strategic"
+    return "enhance_approach"
+
+def roadmap_keys(average_score):
+    """Development roadmap steps for an average answer level"""
+    if average_score <= 3:
+        return ["next_steps_growth", "expand_planning", "strategic_projects", "mentorship_guidance"]
+    elif average_score <= 5:
+        return ["next_steps_growth", "systems_thinking", "vision_development", "cross_functional"]
+    return ["next_steps_growth", "mentorship_share", "organizational_influence", "industry_leadership"]
+
+def leadership_focus_key(level):
+    """Leadership development focus for a final stratum level"""
+    if level <= 3:
+        return "focus_strategic"
+    elif level <= 5:
+        return "enhance_systemic"
+    return "leverage_visionary"
@@ -0,0 +1,137 @@
+# scoring/exports.py - Export documents and their encoded files
+#
+# generate_csv_data / generate_json_data build an assessment's export
+# documents. They are only encoded when a download is actually requested.
+# Encoded files are kept in a small process-wide LRU keyed by a hash of the
+# document, so identical documents are encoded once and share one bytes object.
+import csv
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from scoring.core import categorize_questions
+from scoring.questions import QUESTION_BANK, answer_levels
+from scoring.reports import compile_report
+
+EXPORT_CACHE_SIZE = 128
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+}
+
+_payloads = OrderedDict()
+_payloads_lock = threading.Lock()
+
+
+def generate_csv_data(selections, avg_level, purpose, language="en", completed_at=None):
+    """Generate CSV data for export from the selected option indices (completed now by default)"""
+    completed_at = completed_at or datetime.now()
+    answers = [level for level in answer_levels(selections) if level is not None]
+    csv_data = []
+    
+    # Add header
+    csv_data.append(["Question", "Category", "Your Answer Level", "Selected Option"])
+    
+    # Add question data
+    categories = categorize_questions(language)
+    for i, (question, option_index) in enumerate(zip(QUESTION_BANK, selections)):
+        if option_index is None:
+            continue
+        csv_data.append([
+            f"Question {i+1}",
+            categories[i],
+            f"Stratum {question.level_for(option_index)}",
+            question.option_text(option_index, language)
+        ])
+    
+    # Add summary data
+    csv_data.append([])
+    csv_data.append(["Summary", "Value"])
+    csv_data.append(["Final Stratum Level", f"Level {avg_level}"])
+    csv_data.append(["Assessment Purpose", purpose])
+    csv_data.append(["Date Completed", completed_at.strftime("%Y-%m-%d %H:%M:%S")])
+    csv_data.append(["Total Questions", len(answers)])
+    csv_data.append(["Average Score", f"{sum(answers)/len(answers):.1f}"])
+    
+    return csv_data
+
+
+def generate_json_data(selections, avg_level, purpose, language="en", completed_at=None):
+    """Generate JSON data for export from the selected option indices (completed now by default)"""
+    completed_at = completed_at or datetime.now()
+    answers = [level for level in answer_levels(selections) if level is not None]
+    categories = categorize_questions(language)
+    
+    data = {
+        "assessment_info": {
+            "date_completed": completed_at.isoformat(),
+            "purpose": purpose,
+            "total_questions": len(answers),
+            "final_stratum_level": avg_level,
+            "average_score": round(sum(answers)/len(answers), 1)
+        },
+        "answers": []
+    }
+    
+    for i, (question, option_index) in enumerate(zip(QUESTION_BANK, selections)):
+        if option_index is None:
+            continue
+        data["answers"].append({
+            "question_number": i + 1,
+            "category": categories[i],
+            "question_text": question.text[language],
+            "answer_level": question.level_for(option_index),
+            "selected_option": question.option_text(option_index, language)
+        })
+    
+    return data
+
+
+def generate_summary_report(answers, avg_level, summary, description, purpose, language="en"):
+    """Generate the markdown summary report for the export tab"""
+    return compile_report(language, "markdown").render(answers, avg_level, summary, description, purpose)
+
+
+def encode_csv(rows):
+    """Encode rows with a real CSV writer (quoting commas, quotes and newlines)"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_json(data):
+    """Encode a JSON document as UTF-8 bytes"""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "json": encode_json,
+}
+
+
+def content_hash(file_type, data):
+    """Stable hash of an export document"""
+    canonical = json.dumps([file_type, data], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def export_bytes(data, file_type):
+    """Return the encoded export file, reusing a cached copy of identical content"""
+    digest = content_hash(file_type, data)
+    with _payloads_lock:
+        payload = _payloads.get(digest)
+        if payload is not None:
+            _payloads.move_to_end(digest)
+            return payload
+
+    payload = ENCODERS[file_type](data)
+    with _payloads_lock:
+        _payloads[digest] = payload
+        while len(_payloads) > EXPORT_CACHE_SIZE:
+            _payloads.popitem(last=False)
+    return payload
@@ -0,0 +1,230 @@
+# scoring/loader.py - Question banks from JSON/YAML data files with a compiled cache
+#
+# A bank file is a list of questions (or {"questions": [...]}) in the same
+# shape as QUESTIONS_MULTILINGUAL:
+#   {"text": {lang: str}, "options": {lang: [str, ...]}, "levels": [int, ...]}
+#
+# The first load validates the file and writes <file>.qbank next to it:
+#   header   marshal format and Python version, source mtime, size and
+#            SHA-256, question count
+#   levels   the languages every question covers and every question's option
+#            levels (one small marshal blob)
+#   offsets  where each question's record starts
+#   records  one marshal blob of (text, options) per question
+# Later loads check the header against os.stat() and the running Python, and
+# memory-map the cache; a cache written by another Python is rebuilt.
+# Only the level table is decoded up front; a question's texts are decoded the
+# first time it is used, so a bank of thousands of items in many languages
+# opens in about a millisecond. A changed mtime with unchanged content (e.g.
+# after a checkout) only refreshes the header.
+#
+# YAML needs PyYAML, which is optional; JSON banks need nothing extra.
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Sequence
+
+from scoring.questions import CompiledQuestion
+
+CACHE_SUFFIX = ".qbank"
+CACHE_MAGIC = b"QBNK"
+CACHE_VERSION = 2
+# magic, version, marshal version, Python major.minor, source mtime_ns, source size, source sha256,
+# question count, levels blob size
+CACHE_HEADER = struct.Struct("<4sHHBBqq32sII")
+RUNTIME = (marshal.version, *sys.version_info[:2])
+OFFSET = struct.Struct("<Q")
+
+LEVEL_RANGE = range(1, 8)
+
+
+def read_bank_file(path):
+    """Parse a JSON or YAML bank file into a list of question dicts"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as f:
+        raw = f.read()
+    if extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(f"{path}: loading YAML question banks needs PyYAML (pip install pyyaml)")
+        data = yaml.safe_load(raw)
+    elif extension == ".json":
+        data = json.loads(raw)
+    else:
+        raise ValueError(f"{path}: question banks must be .json, .yaml or .yml files")
+    if isinstance(data, dict):
+        data = data.get("questions")
+    return data
+
+
+def validate_questions(data, source="question bank"):
+    """Check data against the text/options/levels schema; return it as plain tuples
+
+    Each question becomes (text, options, levels) with options as tuples, ready
+    for CompiledQuestion. Raises ValueError naming the first problem found.
+    """
+    if not isinstance(data, list) or not data:
+        raise ValueError(f"{source}: expected a non-empty list of questions")
+
+    questions = []
+    for number, question in enumerate(data, start=1):
+        where = f"{source}: question {number}"
+        if not isinstance(question, dict):
+            raise ValueError(f"{where}: expected an object")
+        missing = {"text", "options", "levels"} - set(question)
+        if missing:
+            raise ValueError(f"{where}: missing {', '.join(sorted(missing))}")
+
+        text, options, levels = question["text"], question["options"], question["levels"]
+        if not isinstance(text, dict) or not text or not all(isinstance(t, str) for t in text.values()):
+            raise ValueError(f"{where}: 'text' must map languages to strings")
+        if not isinstance(levels, list) or not levels:
+            raise ValueError(f"{where}: 'levels' must be a non-empty list")
+        for level in levels:
+            if isinstance(level, bool) or not isinstance(level, int) or level not in LEVEL_RANGE:
+                raise ValueError(f"{where}: level {level!r} is not an integer from 1 to 7")
+        if not isinstance(options, dict) or set(options) != set(text):
+            raise ValueError(f"{where}: 'options' must have the same languages as 'text'")
+        for language, texts in options.items():
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError(f"{where}: '{language}' options must be a list of strings")
+            if len(texts) != len(levels):
+                raise ValueError(f"{where}: {len(texts)} '{language}' options for {len(levels)} levels")
+
+        questions.append((
+            dict(text),
+            {language: tuple(texts) for language, texts in options.items()},
+            tuple(levels),
+        ))
+    return tuple(questions)
+
+
+def cache_path(path):
+    return path + CACHE_SUFFIX
+
+
+def _source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def bank_languages(questions):
+    """Languages that every validated question has texts for, sorted"""
+    languages = set(questions[0][0])
+    for text, _, _ in questions[1:]:
+        languages &= set(text)
+    return tuple(sorted(languages))
+
+
+def cache_bytes(stat, digest, questions):
+    """Encode validated questions in the .qbank layout"""
+    levels = marshal.dumps((bank_languages(questions), tuple(levels for _, _, levels in questions)))
+    records = [marshal.dumps((text, options)) for text, options, _ in questions]
+    offsets = bytearray()
+    position = 0
+    for record in records:
+        offsets += OFFSET.pack(position)
+        position += len(record)
+    offsets += OFFSET.pack(position)
+    header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, *RUNTIME, stat.st_mtime_ns, stat.st_size, digest,
+                               len(questions), len(levels))
+    return b"".join([header, levels, bytes(offsets), *records])
+
+
+def write_cache(path, stat, digest, questions):
+    """Atomically write the compiled cache of a bank file"""
+    target = cache_path(path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(cache_bytes(stat, digest, questions))
+    os.replace(tmp_path, target)
+
+
+class QuestionBankFile(Sequence):
+    """Read-only sequence of CompiledQuestion backed by a compiled cache
+
+    levels holds every question's option levels and languages the languages
+    every question covers, both without decoding any text.
+    """
+
+    def __init__(self, data):
+        magic, version, *runtime, _, _, _, count, levels_size = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or tuple(runtime) != RUNTIME:
+            raise ValueError("not a compiled question bank for this Python")
+        position = CACHE_HEADER.size
+        self._data = data
+        self.languages, self.levels = marshal.loads(data[position:position + levels_size])
+        position += levels_size
+        self._offsets_start = position
+        self._records_start = position + (count + 1) * OFFSET.size
+        self._questions = [None] * count
+
+    def __len__(self):
+        return len(self._questions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        question = self._questions[index]
+        if question is None:
+            index = range(len(self))[index]
+            start, = OFFSET.unpack_from(self._data, self._offsets_start + index * OFFSET.size)
+            end, = OFFSET.unpack_from(self._data, self._offsets_start + (index + 1) * OFFSET.size)
+            start += self._records_start
+            end += self._records_start
+            text, options = marshal.loads(self._data[start:end])
+            question = CompiledQuestion(index + 1, {"text": text, "options": options, "levels": self.levels[index]})
+            self._questions[index] = question
+        return question
+
+
+def _open_cache(path, stat):
+    """The mapped cache, or None when missing or stale; refreshes the header on a touch-only change"""
+    try:
+        with open(cache_path(path), "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, version, *runtime, mtime_ns, size, digest, count, levels_size = CACHE_HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or tuple(runtime) != RUNTIME:
+        return None
+    if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+        if size != stat.st_size or digest != _source_digest(path):
+            return None
+        header = CACHE_HEADER.pack(magic, version, *runtime, stat.st_mtime_ns, size, digest, count, levels_size)
+        try:
+            with open(cache_path(path), "r+b") as f:
+                f.write(header)
+        except OSError:
+            pass
+    return data
+
+
+def load_question_bank(path):
+    """Load a bank file as a sequence of CompiledQuestion, via the compiled cache"""
+    stat = os.stat(path)
+    data = _open_cache(path, stat)
+    if data is None:
+        questions = validate_questions(read_bank_file(path), source=path)
+        digest = _source_digest(path)
+        try:
+            write_cache(path, stat, digest, questions)
+        except OSError:
+            # Read-only data directory: keep the compiled bank in memory
+            return QuestionBankFile(cache_bytes(stat, digest, questions))
+        data = _open_cache(path, stat)
+    return QuestionBankFile(data)
+
+
+if __name__ == "__main__":
+    # Validate and precompile bank files, e.g. at image build time
+    for bank_path in sys.argv[1:]:
+        bank = load_question_bank(bank_path)
+        print(f"{bank_path}: {len(bank)} questions, languages {', '.join(bank.languages)}")
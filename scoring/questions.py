@@ -0,0 +1,99 @@
+# scoring/questions.py - QUESTIONS_MULTILINGUAL compiled once into immutable lookups
+#
+# Set TIME_SPAN_QUESTION_BANK to a JSON/YAML bank file (see scoring/loader.py)
+# to use it instead of the built-in questions.
+#
+# Answers are identified by option index (position in the question's option
+# list), never by display text or level: two options may share a level, and
+# the same option has different text in every language.
+import os
+from types import MappingProxyType
+
+from scoring.questions_multilingual import QUESTIONS_MULTILINGUAL
+
+
+class CompiledQuestion:
+    """Read-only question with O(1) option index <-> level lookups"""
+    __slots__ = ("number", "text", "options", "levels", "_options_by_level")
+
+    def __init__(self, number, question):
+        levels = tuple(question["levels"])
+        options = {language: tuple(texts) for language, texts in question["options"].items()}
+        for language, texts in options.items():
+            if len(texts) != len(levels):
+                raise ValueError(
+                    f"Question {number}: {len(texts)} '{language}' options for {len(levels)} levels"
+                )
+
+        options_by_level = {}
+        for option_index, level in enumerate(levels):
+            options_by_level.setdefault(level, []).append(option_index)
+
+        set_slot = object.__setattr__
+        set_slot(self, "number", number)
+        set_slot(self, "text", MappingProxyType(dict(question["text"])))
+        set_slot(self, "options", MappingProxyType(options))
+        set_slot(self, "levels", levels)
+        set_slot(self, "_options_by_level", MappingProxyType(
+            {level: tuple(indices) for level, indices in options_by_level.items()}
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledQuestion is immutable")
+
+    def __len__(self):
+        return len(self.levels)
+
+    def level_for(self, option_index):
+        """Return the stratum level of an option"""
+        return self.levels[option_index]
+
+    def options_for_level(self, level):
+        """Return all option indices with the given level (empty tuple if none)"""
+        return self._options_by_level.get(level, ())
+
+    def option_for_level(self, level):
+        """Return the first option index with the given level; ValueError if none"""
+        indices = self._options_by_level.get(level)
+        if not indices:
+            raise ValueError(f"Question {self.number}: no option with level {level}")
+        return indices[0]
+
+    def option_text(self, option_index, language="en"):
+        """Return the display text of an option"""
+        return self.options[language][option_index]
+
+
+def _load_bank():
+    """QUESTIONS_MULTILINGUAL, or the data file named by TIME_SPAN_QUESTION_BANK"""
+    path = os.environ.get("TIME_SPAN_QUESTION_BANK")
+    if not path:
+        return tuple(CompiledQuestion(i + 1, q) for i, q in enumerate(QUESTIONS_MULTILINGUAL))
+
+    from config.languages import LANGUAGES
+    from scoring.loader import load_question_bank
+    bank = load_question_bank(path)
+    # Categories, exports and the assessment store are defined per question position
+    if len(bank) != len(QUESTIONS_MULTILINGUAL):
+        raise ValueError(f"{path}: the app needs {len(QUESTIONS_MULTILINGUAL)} questions, found {len(bank)}")
+    # Every question is shown in whichever language the user picks
+    missing = [language for language in LANGUAGES if language not in bank.languages]
+    if missing:
+        raise ValueError(f"{path}: not every question has {', '.join(missing)} texts")
+    return tuple(bank)
+
+
+QUESTION_BANK = _load_bank()
+
+
+def answer_levels(selections):
+    """Map a sequence of selected option indices to their stratum levels (None stays None)"""
+    return [
+        None if option_index is None else question.levels[option_index]
+        for question, option_index in zip(QUESTION_BANK, selections)
+    ]
+
+
+def selections_for_levels(levels):
+    """Map stratum levels back to option indices (first option per level)"""
+    return [question.option_for_level(level) for question, level in zip(QUESTION_BANK, levels)]
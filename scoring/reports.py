@@ -0,0 +1,116 @@
+# scoring/reports.py - Summary report templates compiled once per language
+#
+# A report is almost entirely fixed, translated text; only a handful of fields
+# change per assessment. compile_report() resolves every get_text() lookup once
+# per (language, format) and keeps the report as (literal, field) pairs, so
+# rendering a report is a single join with no translation lookups.
+import html
+import string
+from datetime import datetime
+from functools import lru_cache
+
+from config.languages import get_text
+from scoring.content import language_bundle
+from scoring.questions import QUESTION_BANK
+
+FORMATS = ("markdown", "html")
+FILE_EXTENSIONS = {"markdown": ".md", "html": ".html"}
+DATE_FORMAT = "%B %d, %Y at %I:%M %p"
+
+
+def _markdown_source(t):
+    return f"""
+# {t('report_title')}
+
+**{t('assessment_date')}** {{date}}
+**{t('assessment_purpose')}** {{purpose}}
+**{t('final_stratum_level')}** {{avg_level}}
+
+## {t('key_results')}
+- **{t('your_time_horizon')}** {{time_horizon}}
+- **{t('consistency_range')}** {{consistency_range}} {t('levels')}
+- **{t('questions_completed_report')}** {{answered}}/{len(QUESTION_BANK)}
+
+## {t('summary_section')}
+{{summary}}
+
+{{description}}
+
+## {t('development_focus')}
+{{development_tip}}
+"""
+
+
+def _html_source(t, language):
+    return f"""<!DOCTYPE html>
+<html lang="{language}">
+<head><meta charset="utf-8"><title>{t('report_title')}</title></head>
+<body>
+<h1>{t('report_title')}</h1>
+<p><strong>{t('assessment_date')}</strong> {{date}}<br>
+<strong>{t('assessment_purpose')}</strong> {{purpose}}<br>
+<strong>{t('final_stratum_level')}</strong> {{avg_level}}</p>
+<h2>{t('key_results')}</h2>
+<ul>
+<li><strong>{t('your_time_horizon')}</strong> {{time_horizon}}</li>
+<li><strong>{t('consistency_range')}</strong> {{consistency_range}} {t('levels')}</li>
+<li><strong>{t('questions_completed_report')}</strong> {{answered}}/{len(QUESTION_BANK)}</li>
+</ul>
+<h2>{t('summary_section')}</h2>
+<p>{{summary}}</p>
+<p>{{description}}</p>
+<h2>{t('development_focus')}</h2>
+<p>{{development_tip}}</p>
+</body>
+</html>
+"""
+
+
+def _no_escape(text):
+    return text
+
+
+class ReportTemplate:
+    """A compiled report for one language and format"""
+    __slots__ = ("parts", "time_horizons", "development_tips", "escape")
+
+    def __init__(self, parts, time_horizons, development_tips, escape):
+        self.parts = parts
+        self.time_horizons = time_horizons
+        self.development_tips = development_tips
+        self.escape = escape
+
+    def render(self, answers, avg_level, summary, description, purpose, completed_at=None):
+        """Render one report (completed_at defaults to now)"""
+        escape = self.escape
+        values = {
+            "date": (completed_at or datetime.now()).strftime(DATE_FORMAT),
+            "purpose": escape(purpose),
+            "avg_level": avg_level,
+            "time_horizon": self.time_horizons[avg_level],
+            "consistency_range": max(answers) - min(answers),
+            "answered": len(answers),
+            "summary": escape(summary),
+            "description": escape(description),
+            "development_tip": self.development_tips[avg_level],
+        }
+        return "".join([literal if field is None else f"{literal}{values[field]}" for literal, field in self.parts])
+
+
+@lru_cache(maxsize=None)
+def compile_report(language="en", file_format="markdown"):
+    """Return the ReportTemplate for a language and format ("markdown" or "html")"""
+    if file_format not in FORMATS:
+        raise ValueError(f"file_format must be one of {FORMATS}, got '{file_format}'")
+    escape = html.escape if file_format == "html" else _no_escape
+
+    def t(key):
+        # Translated text is literal in the template source
+        return escape(get_text(key, language)).replace("{", "{{").replace("}", "}}")
+
+    source = _html_source(t, language) if file_format == "html" else _markdown_source(t)
+    parts = tuple((literal, field or None) for literal, field, _, _ in string.Formatter().parse(source))
+    bundle = language_bundle(language)
+    time_horizons = {level: escape(text) for level, text in bundle.time_horizons.items()}
+    development_tips = {level: escape(text) for level, text in bundle.development_tips.items()}
+    return ReportTemplate(parts, time_horizons, development_tips, escape)
@@ -0,0 +1,183 @@
+# scoring_api.py - Local HTTP scoring service (ASGI), independent of the Streamlit UI
+#
+# Usage (the server comes from requirements-tools.txt, which the app's
+# preflight does not install):
+#   pip install -r requirements-tools.txt
+#   python scoring_api.py --port 8000 --workers 2
+#   uvicorn scoring_api:app --port 8000
+#
+# Endpoints (JSON in, JSON out):
+#   GET  /health
+#   POST /score          one response, same fields as a bulk_score.py JSONL line:
+#                        {"id": ..., "answers": [12 levels]} or {"options": [12 option indices]},
+#                        optional "purpose" (text or purpose key), "language"
+#   POST /score/batch    {"responses": [...]} (or a bare list), scored in one vectorized pass
+#
+# Each result has the final stratum, interpret_level() summary/description and
+# the category analysis (averages, strengths, weaknesses). The app is a plain
+# ASGI callable with no framework; connection handling and keep-alive are the
+# server's (uvicorn's) job, so many clients can share a few persistent sockets.
+import argparse
+import asyncio
+import json
+import os
+
+import numpy as np
+
+from bulk_score import parse_response
+from config.languages import LANGUAGES
+from scoring import answer_levels, interpret_level
+from scoring.batch import row_analysis, score_batch
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_SIZE = 10000
+# Batches at least this large are scored off the event loop
+THREAD_BATCH_SIZE = 256
+
+
+def score_responses(records, default_language="en", default_purpose="purpose_self"):
+    """Score raw response records; return one result dict per record, in order
+
+    Raises ValueError naming the offending response.
+    """
+    parsed = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"response {i}: expected a JSON object")
+        parsed.append(parse_response(record, f"response {i}", default_language, default_purpose))
+
+    results = [None] * len(parsed)
+    # One vectorized pass per language (category names are localized)
+    for language in LANGUAGES:
+        rows = [i for i, response in enumerate(parsed) if response[3] == language]
+        if not rows:
+            continue
+        levels = np.array([answer_levels(parsed[i][1]) for i in rows], dtype=np.int64)
+        scores = score_batch(levels, language)
+        for row, i in enumerate(rows):
+            respondent_id, _, purpose, _, _ = parsed[i]
+            final_stratum = int(scores["levels"][row])
+            summary, description = interpret_level(final_stratum, purpose, language)
+            category_averages, strengths, weaknesses = row_analysis(scores, row)
+            result = {
+                "final_stratum": final_stratum,
+                "average_score": float(scores["average_scores"][row]),
+                "summary": summary,
+                "description": description,
+                "purpose": purpose,
+                "language": language,
+                "category_averages": category_averages,
+                "strengths": [{"category": c, "score": s} for c, s in strengths],
+                "weaknesses": [{"category": c, "score": s} for c, s in weaknesses],
+            }
+            if respondent_id is not None:
+                result = {"respondent_id": respondent_id, **result}
+            results[i] = result
+    return results
+
+
+async def _read_body(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise OverflowError
+        if not message.get("more_body", False):
+            return bytes(body)
+
+
+async def _send_json(send, status, data):
+    payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json; charset=utf-8"),
+            (b"content-length", str(len(payload)).encode("ascii")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _handle_score(receive, send, batch):
+    try:
+        body = await _read_body(receive)
+    except OverflowError:
+        return await _send_json(send, 413, {"error": f"request body over {MAX_BODY_BYTES} bytes"})
+    if body is None:
+        return
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return await _send_json(send, 400, {"error": "request body is not valid JSON"})
+
+    if batch:
+        records = payload.get("responses") if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            return await _send_json(send, 400, {"error": "expected {\"responses\": [...]} or a JSON list"})
+        if len(records) > MAX_BATCH_SIZE:
+            return await _send_json(send, 413, {"error": f"at most {MAX_BATCH_SIZE} responses per batch"})
+    else:
+        records = [payload]
+
+    try:
+        if len(records) >= THREAD_BATCH_SIZE:
+            results = await asyncio.to_thread(score_responses, records)
+        else:
+            results = score_responses(records)
+    except ValueError as e:
+        return await _send_json(send, 400, {"error": str(e)})
+
+    await _send_json(send, 200, {"results": results} if batch else results[0])
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/") or "/"
+    method = scope["method"]
+    if path == "/health":
+        if method != "GET":
+            return await _send_json(send, 405, {"error": "use GET"})
+        return await _send_json(send, 200, {"status": "ok"})
+    if path in ("/score", "/score/batch"):
+        if method != "POST":
+            return await _send_json(send, 405, {"error": "use POST"})
+        return await _handle_score(receive, send, batch=path == "/score/batch")
+    await _send_json(send, 404, {"error": f"no route for {path}"})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Time Span Estimator scoring API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    parser.add_argument("--keep-alive", type=int, default=30, help="idle seconds before closing a connection")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        parser.exit(1, "scoring_api: uvicorn is not installed (pip install -r requirements-tools.txt)\n")
+
+    # Workers re-import the app by name, so run from this directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    uvicorn.run("scoring_api:app", host=args.host, port=args.port, workers=args.workers,
+                timeout_keep_alive=args.keep_alive, access_log=False, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
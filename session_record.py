@@ -0,0 +1,109 @@
+# session_record.py - Compact per-session assessment state
+#
+# One small object per session instead of loose st.session_state keys:
+# - answers are option indices packed into a bytearray, one byte per question,
+#   with UNANSWERED for questions not (yet) answered, so linear and adaptive
+#   assessments share one positional layout;
+# - page, language and purpose are small integer ids; localized labels are
+#   looked up when displayed, so switching language also switches the purpose
+#   label and its interpretation.
+#
+# Whether a session is adaptive is decided here too (TIME_SPAN_ADAPTIVE=1 or
+# ?adaptive=1), so the app imports the numpy-based adaptive module only for
+# adaptive sessions.
+
+from config.flags import flag_enabled
+from config.languages import LANGUAGES
+from scoring.content import language_bundle
+from scoring.questions import QUESTION_BANK
+
+PAGES = ("start", "questions", "result")
+LANGUAGE_CODES = tuple(LANGUAGES)
+UNANSWERED = 0xFF
+
+ADAPTIVE_ENV_FLAG = "TIME_SPAN_ADAPTIVE"
+ADAPTIVE_QUERY_FLAG = "adaptive"
+
+_ADAPTIVE = 1
+_RECORDED = 2
+
+
+def adaptive_enabled(query_params=None):
+    """True when the env var or the ?adaptive= query flag turns adaptive mode on"""
+    return flag_enabled(ADAPTIVE_ENV_FLAG, query_params, ADAPTIVE_QUERY_FLAG)
+
+
+class SessionRecord:
+    """Page, language, purpose, answers and flags of one session"""
+    __slots__ = ("_page", "_language", "purpose_id", "current_q", "_flags", "_answers", "cohort")
+
+    def __init__(self, language="en", cohort="", adaptive=False):
+        self._page = 0
+        self._language = LANGUAGE_CODES.index(language)
+        self.purpose_id = 0
+        self.current_q = 0
+        self._flags = _ADAPTIVE if adaptive else 0
+        self._answers = bytearray([UNANSWERED]) * len(QUESTION_BANK)
+        self.cohort = cohort
+
+    @property
+    def page(self):
+        return PAGES[self._page]
+
+    @page.setter
+    def page(self, page):
+        self._page = PAGES.index(page)
+
+    @property
+    def language(self):
+        return LANGUAGE_CODES[self._language]
+
+    @language.setter
+    def language(self, language):
+        self._language = LANGUAGE_CODES.index(language)
+
+    def purpose(self, language=None):
+        """Localized purpose label (in the session's language by default)"""
+        return language_bundle(language or self.language).purposes[self.purpose_id]
+
+    @property
+    def adaptive(self):
+        return bool(self._flags & _ADAPTIVE)
+
+    @property
+    def recorded(self):
+        """True once the result was written to the assessment store"""
+        return bool(self._flags & _RECORDED)
+
+    @recorded.setter
+    def recorded(self, value):
+        self._flags = self._flags | _RECORDED if value else self._flags & ~_RECORDED
+
+    @property
+    def selections(self):
+        """Option index per question, None where unanswered"""
+        return [None if option_index == UNANSWERED else option_index for option_index in self._answers]
+
+    @property
+    def complete(self):
+        return UNANSWERED not in self._answers
+
+    def answered_count(self):
+        return len(self._answers) - self._answers.count(UNANSWERED)
+
+    def answer(self, q_index, option_index):
+        self._answers[q_index] = option_index
+
+    def start(self, purpose_id, first_question=0):
+        """Begin the questions with a purpose id (index into scoring.PURPOSE_KEYS)"""
+        self.purpose_id = purpose_id
+        self.current_q = first_question
+        self.page = "questions"
+
+    def restart(self):
+        """Back to the start page with no answers; language, cohort and mode are kept"""
+        self._page = 0
+        self.purpose_id = 0
+        self.current_q = 0
+        self._flags &= _ADAPTIVE
+        self._answers = bytearray([UNANSWERED]) * len(QUESTION_BANK)
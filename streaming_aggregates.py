@@ -0,0 +1,164 @@
+# streaming_aggregates.py - Running per-category statistics that merge across workers
+#
+# Each completed assessment updates a fixed number of counters (one per
+# category plus the stratum histogram of its group), so the cost of an update
+# does not depend on how many assessments came before. Aggregates built on
+# different shards or worker processes combine exactly with merge(), and
+# to_dict()/from_dict() carry them between processes as plain JSON.
+import threading
+from collections import defaultdict
+
+from scoring import CATEGORY_KEYS, analyze_by_category
+
+# analyze_by_category() grouping by language-neutral category keys
+CATEGORY_IDS = dict(enumerate(CATEGORY_KEYS))
+
+STRATA = range(1, 8)
+
+
+class RunningStats:
+    """Count, mean and variance via Welford's update and Chan's merge"""
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        """Population variance (0.0 with fewer than two values)"""
+        return self.m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class GroupAggregates:
+    """Per-category running stats and stratum histograms for one group"""
+    __slots__ = ("categories", "histograms", "strata")
+
+    def __init__(self):
+        self.categories = {key: RunningStats() for key in dict.fromkeys(CATEGORY_KEYS)}
+        # Histogram of each category's (rounded) level, and of final strata
+        self.histograms = {key: [0] * (len(STRATA) + 1) for key in self.categories}
+        self.strata = [0] * (len(STRATA) + 1)
+
+    def add(self, levels, final_stratum):
+        for key, average in analyze_by_category(levels, categories=CATEGORY_IDS).items():
+            self.categories[key].add(average)
+            self.histograms[key][round(average)] += 1
+        self.strata[final_stratum] += 1
+
+    def merge(self, other):
+        for key, stats in other.categories.items():
+            self.categories[key].merge(stats)
+            histogram = self.histograms[key]
+            for level, n in enumerate(other.histograms[key]):
+                histogram[level] += n
+        for stratum, n in enumerate(other.strata):
+            self.strata[stratum] += n
+
+
+class StreamingAggregates:
+    """Running aggregates keyed by (cohort, purpose_id), safe to update from any thread"""
+
+    def __init__(self):
+        self._groups = defaultdict(GroupAggregates)
+        self._lock = threading.Lock()
+
+    def add(self, levels, final_stratum, purpose_id=None, cohort=""):
+        """Fold one completed assessment (answer levels in question order) in"""
+        with self._lock:
+            self._groups[(cohort, purpose_id)].add(levels, final_stratum)
+
+    def keys(self):
+        """(cohort, purpose_id) of every group seen so far"""
+        with self._lock:
+            return list(self._groups)
+
+    def merge(self, other):
+        """Fold another aggregate (e.g. from a different shard or worker) in"""
+        with other._lock:
+            groups = list(other._groups.items())
+        with self._lock:
+            for key, group in groups:
+                self._groups[key].merge(group)
+
+    def summary(self, cohort=None, purpose_id=None):
+        """Combined statistics for the matching groups (None matches all)
+
+        Returns count, strata {stratum: n} and categories {category_key:
+        {count, mean, variance, std, histogram {level: n}}}.
+        """
+        combined = GroupAggregates()
+        with self._lock:
+            for (group_cohort, group_purpose), group in self._groups.items():
+                if cohort is not None and group_cohort != cohort:
+                    continue
+                if purpose_id is not None and group_purpose != purpose_id:
+                    continue
+                combined.merge(group)
+        return {
+            "count": sum(combined.strata),
+            "strata": {s: combined.strata[s] for s in STRATA if combined.strata[s]},
+            "categories": {
+                key: {
+                    "count": stats.count,
+                    "mean": stats.mean,
+                    "variance": stats.variance,
+                    "std": stats.std,
+                    "histogram": {level: n for level, n in enumerate(combined.histograms[key]) if n},
+                }
+                for key, stats in combined.categories.items()
+            },
+        }
+
+    def to_dict(self, keys=None):
+        """JSON-serializable snapshot, of all groups or only those in keys"""
+        with self._lock:
+            groups = self._groups.items() if keys is None else [
+                (key, self._groups[key]) for key in keys if key in self._groups
+            ]
+            return {
+                "groups": [
+                    {
+                        "cohort": cohort,
+                        "purpose_id": purpose,
+                        "categories": {k: [s.count, s.mean, s.m2] for k, s in group.categories.items()},
+                        "histograms": {k: list(h) for k, h in group.histograms.items()},
+                        "strata": list(group.strata),
+                    }
+                    for (cohort, purpose), group in groups
+                ]
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        for item in data["groups"]:
+            group = aggregates._groups[(item["cohort"], item["purpose_id"])]
+            for key, (count, mean, m2) in item["categories"].items():
+                group.categories[key] = RunningStats(count, mean, m2)
+                group.histograms[key] = list(item["histograms"][key])
+            group.strata = list(item["strata"])
+        return aggregates
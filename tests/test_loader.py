@@ -0,0 +1,150 @@
+# tests/test_loader.py - Invalidation paths of the compiled .qbank cache
+import json
+import os
+
+import pytest
+
+from scoring import loader
+
+QUESTIONS = [
+    {"text": {"en": "First?", "sv": "Först?"},
+     "options": {"en": ["a", "b"], "sv": ["á", "b"]}, "levels": [1, 3]},
+    {"text": {"en": "Second?", "sv": "Andra?"},
+     "options": {"en": ["c", "d", "e"], "sv": ["c", "d", "e"]}, "levels": [2, 4, 6]},
+]
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps(QUESTIONS), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """Count how often the bank file itself is parsed (i.e. the cache was not used)"""
+    calls = []
+    read_bank_file = loader.read_bank_file
+
+    def counting(path):
+        calls.append(path)
+        return read_bank_file(path)
+
+    monkeypatch.setattr(loader, "read_bank_file", counting)
+    return calls
+
+
+def cache_header(path):
+    with open(loader.cache_path(path), "rb") as f:
+        return loader.CACHE_HEADER.unpack_from(f.read())
+
+
+def patch_cache_header(path, **fields):
+    names = ("magic", "version", "marshal_version", "major", "minor", "mtime_ns", "size", "digest",
+             "count", "levels_size")
+    values = dict(zip(names, cache_header(path)))
+    values.update(fields)
+    with open(loader.cache_path(path), "r+b") as f:
+        f.write(loader.CACHE_HEADER.pack(*(values[name] for name in names)))
+
+
+def assert_bank(bank, questions=QUESTIONS):
+    assert len(bank) == len(questions)
+    assert bank.languages == ("en", "sv")
+    for question, expected in zip(bank, questions):
+        assert dict(question.text) == expected["text"]
+        assert {language: list(texts) for language, texts in question.options.items()} == expected["options"]
+        assert list(question.levels) == expected["levels"]
+
+
+def test_first_load_writes_cache(bank_path, parse_count):
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 1
+    stat = os.stat(bank_path)
+    assert cache_header(bank_path)[5:7] == (stat.st_mtime_ns, stat.st_size)
+
+
+def test_second_load_uses_cache(bank_path, parse_count):
+    loader.load_question_bank(bank_path)
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 1
+
+
+@pytest.mark.parametrize("field, value", [
+    ("magic", b"XXXX"),
+    ("version", loader.CACHE_VERSION + 1),
+    ("marshal_version", loader.RUNTIME[0] + 1),
+    ("minor", loader.RUNTIME[2] + 1),
+])
+def test_foreign_header_rebuilds(bank_path, parse_count, field, value):
+    loader.load_question_bank(bank_path)
+    patch_cache_header(bank_path, **{field: value})
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 2
+    assert tuple(cache_header(bank_path)[2:5]) == loader.RUNTIME
+
+
+def test_truncated_cache_rebuilds(bank_path, parse_count):
+    loader.load_question_bank(bank_path)
+    with open(loader.cache_path(bank_path), "r+b") as f:
+        f.truncate(loader.CACHE_HEADER.size - 1)
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 2
+
+
+def test_touch_only_refreshes_header(bank_path, parse_count):
+    loader.load_question_bank(bank_path)
+    stat = os.stat(bank_path)
+    os.utime(bank_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 1
+    assert cache_header(bank_path)[5] == os.stat(bank_path).st_mtime_ns
+    # The refreshed header is a plain cache hit from now on
+    loader.load_question_bank(bank_path)
+    assert len(parse_count) == 1
+
+
+def test_changed_content_rebuilds(bank_path, parse_count):
+    loader.load_question_bank(bank_path)
+    changed = json.loads(json.dumps(QUESTIONS))
+    changed[0]["text"]["en"] = "Third?"
+    with open(bank_path, "w", encoding="utf-8") as f:
+        json.dump(changed, f)
+    assert_bank(loader.load_question_bank(bank_path), changed)
+    assert len(parse_count) == 2
+
+
+def test_same_size_change_with_new_mtime_rebuilds(bank_path, parse_count):
+    loader.load_question_bank(bank_path)
+    stat = os.stat(bank_path)
+    changed = json.loads(json.dumps(QUESTIONS))
+    changed[0]["text"]["en"] = "Frist?"
+    with open(bank_path, "w", encoding="utf-8") as f:
+        json.dump(changed, f)
+    assert os.path.getsize(bank_path) == stat.st_size
+    os.utime(bank_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert_bank(loader.load_question_bank(bank_path), changed)
+    assert len(parse_count) == 2
+
+
+def test_read_only_directory_keeps_bank_in_memory(bank_path, parse_count, monkeypatch):
+    def read_only(*args):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(loader, "write_cache", read_only)
+    assert_bank(loader.load_question_bank(bank_path))
+    assert not os.path.exists(loader.cache_path(bank_path))
+    # Without a cache every load parses the file again
+    assert_bank(loader.load_question_bank(bank_path))
+    assert len(parse_count) == 2
+
+
+def test_invalid_bank_names_the_question(tmp_path):
+    path = tmp_path / "bad.json"
+    bad = json.loads(json.dumps(QUESTIONS))
+    bad[1]["levels"] = [2, 4, 9]
+    path.write_text(json.dumps(bad), encoding="utf-8")
+    with pytest.raises(ValueError, match="question 2: level 9"):
+        loader.load_question_bank(str(path))
+    assert not os.path.exists(loader.cache_path(str(path)))
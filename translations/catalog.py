@@ -0,0 +1,163 @@
+# Binary translation catalogs in GNU gettext .mo format
+#
+# Each translations/<lang>.py module is compiled to translations/<lang>.mo the
+# first time that language is requested (or ahead of time with
+# `python -m translations.catalog`). Catalogs are memory-mapped, so untouched
+# strings stay in the shared page cache instead of each process's heap, and
+# strings are decoded lazily on first lookup.
+#
+# Keys are interned to process-wide integer ids, so every loaded catalog is a
+# flat list indexed by the same id. Decoded strings are also kept in the
+# catalog's texts dict, so a repeated lookup is a single dict access.
+import importlib
+import importlib.util
+import mmap
+import os
+import struct
+import threading
+
+MO_MAGIC = 0x950412de
+HEADER = struct.Struct("<7I")
+ENTRY = struct.Struct("<2I")
+
+CATALOG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_key_ids = {}
+_key_lock = threading.Lock()
+
+
+def key_id(key):
+    """Return the interned integer id of a translation key"""
+    try:
+        return _key_ids[key]
+    except KeyError:
+        with _key_lock:
+            return _key_ids.setdefault(key, len(_key_ids))
+
+
+def mo_bytes(texts):
+    """Encode a {key: text} dict as .mo data (keys sorted, no hash table)"""
+    # The "" entry is the standard metadata header, so gettext tools can read it
+    texts = {"": "Content-Type: text/plain; charset=UTF-8\n", **texts}
+    keys = sorted(texts)
+    originals = [key.encode("utf-8") for key in keys]
+    translations = [texts[key].encode("utf-8") for key in keys]
+
+    originals_offset = HEADER.size
+    translations_offset = originals_offset + len(keys) * ENTRY.size
+    data_offset = translations_offset + len(keys) * ENTRY.size
+
+    tables = bytearray()
+    blob = bytearray()
+    for strings in (originals, translations):
+        for s in strings:
+            tables += ENTRY.pack(len(s), data_offset + len(blob))
+            blob += s + b"\0"
+
+    header = HEADER.pack(MO_MAGIC, 0, len(keys), originals_offset, translations_offset, 0, data_offset)
+    return bytes(header + tables + blob)
+
+
+def write_mo(texts, path):
+    """Atomically write a {key: text} dict as a .mo file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(mo_bytes(texts))
+    os.replace(tmp_path, path)
+
+
+class Catalog:
+    """A memory-mapped .mo catalog with lookups by interned key id"""
+    __slots__ = ("language", "texts", "_data", "_spans", "_values")
+
+    def __init__(self, language, data):
+        self.language = language
+        # {key: text} of every string decoded so far
+        self.texts = {}
+        self._data = data
+        magic, _, count, originals_offset, translations_offset, _, _ = HEADER.unpack_from(data, 0)
+        if magic != MO_MAGIC:
+            raise ValueError(f"{language}: not a little-endian .mo catalog")
+
+        spans = []
+        for i in range(count):
+            key_length, key_offset = ENTRY.unpack_from(data, originals_offset + i * ENTRY.size)
+            ident = key_id(bytes(data[key_offset:key_offset + key_length]).decode("utf-8"))
+            if ident >= len(spans):
+                spans.extend([None] * (ident + 1 - len(spans)))
+            spans[ident] = ENTRY.unpack_from(data, translations_offset + i * ENTRY.size)
+        self._spans = spans
+        self._values = [None] * len(spans)
+
+    def __len__(self):
+        return sum(span is not None for span in self._spans)
+
+    def text(self, ident, default=None):
+        """Return the text for an interned key id, or default if untranslated"""
+        if ident < len(self._values):
+            value = self._values[ident]
+            if value is not None:
+                return value
+            span = self._spans[ident]
+            if span is not None:
+                length, offset = span
+                value = bytes(self._data[offset:offset + length]).decode("utf-8")
+                self._values[ident] = value
+                return value
+        return default
+
+    def get(self, key, default=None):
+        """Return the text for a string key, or default if untranslated"""
+        value = self.texts.get(key)
+        if value is not None:
+            return value
+        ident = _key_ids.get(key)
+        if ident is None:
+            return default
+        value = self.text(ident)
+        if value is None:
+            return default
+        self.texts[key] = value
+        return value
+
+
+def catalog_path(language):
+    return os.path.join(CATALOG_DIR, f"{language}.mo")
+
+
+def compile_catalog(language, module_name, attribute):
+    """Compile one translation module to its .mo file; return the path"""
+    module = importlib.import_module(module_name)
+    path = catalog_path(language)
+    write_mo(getattr(module, attribute), path)
+    return path
+
+
+def load_catalog(language, module_name, attribute):
+    """Map the language's .mo file, (re)compiling it if missing or stale"""
+    path = catalog_path(language)
+    spec = importlib.util.find_spec(module_name)
+    source = spec.origin if spec else None
+    try:
+        stale = source is not None and os.path.getmtime(source) > os.path.getmtime(path)
+    except OSError:
+        stale = True
+
+    if stale:
+        try:
+            compile_catalog(language, module_name, attribute)
+        except OSError:
+            # Read-only install without prebuilt catalogs: keep it in memory
+            texts = getattr(importlib.import_module(module_name), attribute)
+            return Catalog(language, memoryview(mo_bytes(texts)))
+
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Catalog(language, memoryview(data))
+
+
+if __name__ == "__main__":
+    from config.languages import TRANSLATION_SOURCES
+
+    for language, (module_name, attribute) in TRANSLATION_SOURCES.items():
+        print(f"{language}: {compile_catalog(language, module_name, attribute)}")
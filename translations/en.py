@@ -186,5 +186,22 @@ Select how you intend to use the tool and begin.""",
     "consistency_range": "Consistency Range:",
     "questions_completed_report": "Questions Completed:",
     "summary_section": "Summary",
-    "development_focus": "Development Focus"
+    "development_focus": "Development Focus",
+    
+    # Team view
+    "cohort_title": "👥 Team View",
+    "cohort_select": "Group",
+    "cohort_all": "All groups",
+    "cohort_respondents": "Respondents",
+    "cohort_average_stratum": "Average Stratum",
+    "cohort_no_data": "No completed assessments yet for this group.",
+    "cohort_store_disabled": "Assessment storage is turned off, so there is no team data.",
+    "cohort_stratum_distribution": "Stratum Distribution",
+    "number_of_respondents": "Number of Respondents",
+    "cohort_category_averages": "Average Level by Category",
+    "cohort_purpose_breakdown": "By Purpose",
+    "cohort_purpose_other": "Other",
+    "cohort_category_spread": "Spread by Category",
+    "cohort_std_dev": "Std. Dev.",
+    "cohort_access_denied": "The team view needs a valid access link. Ask your administrator for one."
 } 
\ No newline at end of file
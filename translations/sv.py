@@ -186,5 +186,22 @@ Välj hur du planerar att använda verktyget och börja.""",
     "consistency_range": "Konsistensområde:",
     "questions_completed_report": "Frågor Slutförda:",
     "summary_section": "Sammanfattning",
-    "development_focus": "Utvecklingsfokus"
+    "development_focus": "Utvecklingsfokus",
+    
+    # Team view
+    "cohort_title": "👥 Teamöversikt",
+    "cohort_select": "Grupp",
+    "cohort_all": "Alla grupper",
+    "cohort_respondents": "Respondenter",
+    "cohort_average_stratum": "Genomsnittligt Stratum",
+    "cohort_no_data": "Inga slutförda bedömningar ännu för denna grupp.",
+    "cohort_store_disabled": "Lagring av bedömningar är avstängd, så det finns ingen teamdata.",
+    "cohort_stratum_distribution": "Stratumfördelning",
+    "number_of_respondents": "Antal Respondenter",
+    "cohort_category_averages": "Genomsnittlig Nivå per Kategori",
+    "cohort_purpose_breakdown": "Per Syfte",
+    "cohort_purpose_other": "Övrigt",
+    "cohort_category_spread": "Spridning per Kategori",
+    "cohort_std_dev": "Standardavvikelse",
+    "cohort_access_denied": "Teamöversikten kräver en giltig åtkomstlänk. Be din administratör om en."
 } 
\ No newline at end of file